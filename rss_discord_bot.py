@@ -1,72 +1,1753 @@
-import feedparser
 import time
 import json
 import yaml
-import discord
 from datetime import datetime, timedelta, timezone
 import logging
-from pathlib import Path
 import asyncio
 import os
 from dotenv import load_dotenv
 import argparse
 import re
-from bs4 import BeautifulSoup
 import html
-import requests
-from urllib.parse import urlparse
-import socket
-import ssl
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.probability import FreqDist
-from collections import defaultdict
+from urllib.parse import urlparse, parse_qsl, urlencode
+from collections import defaultdict, deque
 import string
 from urllib.parse import quote
 import aiohttp
 import sqlite3
 from contextlib import contextmanager
 import traceback
+import hashlib
+import math
+import calendar
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import random
+import importlib.util
+import email.utils
+import atexit
+import queue
+import logging.handlers
+from collections import Counter
+
+from html.parser import HTMLParser
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError as e:
-    logging.error(f"NLTK resource 'punkt' not found: {e}. Downloading...")
-    nltk.download('punkt')
 try:
-    nltk.data.find('corpora/stopwords')
-except LookupError as e:
-    logging.error(f"NLTK resource 'stopwords' not found: {e}. Downloading...")
-    nltk.download('stopwords')
-
-load_dotenv()
-config = yaml.safe_load(open('config.yaml'))
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
-                   handlers=[logging.FileHandler(config['settings']['log_file']), logging.StreamHandler()])
-
-class RSSMonitor(discord.Client):
-    def __init__(self, from_start=False, target_category=None):
-        intents = discord.Intents.default()
-        intents.guild_messages = True
-        super().__init__(intents=intents)
-        self.config = yaml.safe_load(open('config.yaml'))
-        logging.info(f"Loaded config: {self.config}")
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# feedparser, BeautifulSoup, lxml and NLTK are imported by the functions that
+# use them, so starting the bot (or a worker process) does not pay for them
+
+# NLTK data used by the summarizer with sentence_splitter: nltk, installed with --setup-nltk
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+}
+
+def setup_nltk():
+    """Download the NLTK data the summarizer uses, if it is not installed yet."""
+    import nltk
+    for resource, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+            logging.info(f"NLTK resource '{resource}' is installed")
+        except LookupError:
+            logging.info(f"Downloading NLTK resource '{resource}'")
+            nltk.download(resource)
+
+@functools.lru_cache(maxsize=None)
+def _lxml_available():
+    """Check whether lxml is installed, without importing it."""
+    return importlib.util.find_spec('lxml') is not None
+
+# Maximum number of values bound in a single SQLite IN (...) lookup
+SQLITE_CHUNK_SIZE = 500
+
+# Bump whenever summarization or categorization output changes, so cached
+# summaries from older versions are no longer used
+SUMMARIZER_VERSION = 4
+
+# Entries published longer ago than this are not posted
+RECENT_ENTRY_DAYS = 7
+
+# Fingerprints of posted entries are kept for cross-feed dedup for this many days
+DUPLICATE_WINDOW_DAYS = 30
+
+# Sent messages are kept in the outbox for this many days
+OUTBOX_SENT_RETENTION_DAYS = 7
+
+# Columns of the feed_state table and their types
+FEED_STATE_COLUMNS = {
+    'etag': 'TEXT',                 # HTTP cache validators from the last fetch
+    'last_modified': 'TEXT',
+    'hwm_published': 'REAL',        # Newest processed entry (unix timestamp and id)
+    'hwm_entry_id': 'TEXT',
+    'poll_interval': 'REAL',        # Daemon mode: learned polling interval and next poll time
+    'next_poll': 'REAL',
+    'date_hint': 'TEXT',            # Date field and format that worked for the feed's entries
+}
+
+# Seconds per syndication module (sy:updatePeriod) period
+UPDATE_PERIOD_SECONDS = {
+    'hourly': 60 * 60,
+    'daily': 24 * 60 * 60,
+    'weekly': 7 * 24 * 60 * 60,
+    'monthly': 30 * 24 * 60 * 60,
+    'yearly': 365 * 24 * 60 * 60,
+}
+
+def _entry_timestamp(entry):
+    """Get an entry's publish (or update) time as a unix timestamp, or None."""
+    for field in ('published_parsed', 'updated_parsed'):
+        date_tuple = entry.get(field)
+        if date_tuple:
+            try:
+                return float(calendar.timegm(date_tuple))
+            except (TypeError, ValueError, OverflowError):
+                continue
+    return None
+
+def _seen_key(feed_name, entry_id):
+    """Build the in-memory membership key for a seen entry."""
+    return f"{feed_name}\x1f{entry_id}"
+
+def _normalize_entry_id(entry_id):
+    """Normalize an entry id so trivially different spellings hash the same.
+
+    Surrounding whitespace is dropped, and for URLs the scheme and host are
+    lowercased and a trailing slash on the path is removed.
+    """
+    entry_id = entry_id.strip()
+    parsed = urlparse(entry_id)
+    if parsed.scheme in ('http', 'https') and parsed.netloc:
+        parsed = parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower(),
+                                 path=parsed.path.rstrip('/'))
+        entry_id = parsed.geturl()
+    return entry_id
+
+def _entry_hash(entry_id):
+    """Hash a normalized entry id to a signed 64-bit integer for the compact seen schema."""
+    digest = hashlib.blake2b(_normalize_entry_id(entry_id).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Membership tests can give false positives but never false negatives, so a
+    miss means the item was definitely never added.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+# English stop words, the same list as NLTK's stopwords corpus
+STOP_WORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself yourselves
+he him his himself she she's her hers herself it it's its itself they them their theirs themselves
+what which who whom this that that'll these those am is are was were be been being have has had
+having do does did doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in out on off over
+under again further then once here there when where why how all any both each few more most other
+some such no nor not only own same so than too very s t can will just don don't should should've
+now d ll m o re ve y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+# Words that end in a period without ending the sentence
+ABBREVIATIONS = frozenset("""
+mr mrs ms dr prof sr jr st mt vs inc ltd corp dept approx al
+jan feb mar apr jun jul aug sep sept oct nov dec
+""".split())
+
+# Abbreviations that are also common words, only when a number follows ("No. 5", "Fig. 2")
+NUMBERED_ABBREVIATIONS = frozenset(['no', 'fig', 'vol', 'pp'])
+
+# Candidate sentence ends: terminal punctuation and closing quotes or brackets,
+# followed by whitespace and the (possibly quoted) capital or digit of the next sentence
+_SENTENCE_END_RE = re.compile(r'[.!?]+[\'"”’)\]]*(?=\s+[\'"“‘(\[]*[A-Z0-9])')
+_DOTTED_ABBREVIATION_RE = re.compile(r'(?:[a-z]\.)+[a-z]')
+
+def split_sentences(text):
+    """Split text into sentences with a regex, without NLTK.
+
+    A period does not end a sentence after a known abbreviation ("Dr."),
+    a numbered abbreviation followed by a number ("No. 5"), a single
+    initial ("J.") or a dotted abbreviation ("e.g.", "U.S.").
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        if match.group()[0] == '.' and match.group().rstrip('\'"”’)]') == '.':
+            words = text[start:match.start()].split()
+            word = words[-1].lstrip('\'"“‘([').lower() if words else ''
+            if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()) or _DOTTED_ABBREVIATION_RE.fullmatch(word):
+                continue
+            if word in NUMBERED_ABBREVIATIONS and text[match.end():].lstrip()[:1].isdigit():
+                continue
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    sentence = text[start:].strip()
+    if sentence:
+        sentences.append(sentence)
+    return sentences
+
+_nltk_stop_words = None
+
+def _get_stop_words(sentence_splitter='builtin'):
+    """Get the stop words: the built-in list, or NLTK's (loaded once per process) when opted in."""
+    global _nltk_stop_words
+    if sentence_splitter != 'nltk':
+        return STOP_WORDS
+    if _nltk_stop_words is None:
+        try:
+            from nltk.corpus import stopwords
+            _nltk_stop_words = frozenset(stopwords.words('english'))
+        except (ImportError, LookupError):
+            logging.warning("NLTK stopwords are not installed (run with --setup-nltk), using the built-in list")
+            _nltk_stop_words = STOP_WORDS
+    return _nltk_stop_words
+
+def _entry_content(entry):
+    """Get the HTML content of a feedparser entry from the first field that has it."""
+    try:
+        if hasattr(entry, 'content'):
+            return entry.content[0].value
+        elif hasattr(entry, 'summary'):
+            return entry.summary
+        elif hasattr(entry, 'description'):
+            return entry.description
+    except (AttributeError, IndexError):
+        pass
+    return None
+
+def _entry_tags(entry):
+    """Get the tag terms of a feedparser entry, including CDATA tags."""
+    tags = []
+    for tag in entry.get('tags', []):
+        # Handle both regular tags and CDATA tags
+        term = tag.get('term', '')
+        if not term and hasattr(tag, 'text'):
+            term = tag.text
+        tags.append(term or '')
+    return tags
+
+# Boilerplate removed from feed text before summarizing, in order of preference
+UNWANTED_PHRASES = [
+    "undefined", "The post", "appeared first on", "Read more",
+    "Continue reading", "Click here", "Read the full article",
+    "View original", "Source:", "via", "Posted by", "Published by",
+    "Written by", "Share this", "Subscribe to", "Follow us",
+    "Join our", "Sign up"
+]
+_UNWANTED_PHRASES_RE = re.compile('|'.join(re.escape(phrase) for phrase in UNWANTED_PHRASES))
+
+class _HTMLTextExtractor(HTMLParser):
+    """Streaming HTML-to-text converter that skips script and style content."""
+
+    SKIPPED_TAGS = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+    def unknown_decl(self, data):
+        # CDATA sections are text, like in BeautifulSoup
+        if data.startswith('CDATA[') and not self._skip_depth:
+            self.parts.append(data[6:])
+
+def _html_to_text_stdlib(content):
+    extractor = _HTMLTextExtractor()
+    extractor.feed(content)
+    extractor.close()
+    return ''.join(extractor.parts)
+
+def _html_to_text_lxml(content):
+    import lxml.etree
+    import lxml.html
+    try:
+        tree = lxml.html.document_fromstring(content)
+    except lxml.etree.ParserError:
+        # Nothing but whitespace or comments
+        return ''
+    lxml.etree.strip_elements(tree, 'script', 'style', lxml.etree.Comment, with_tail=False)
+    return tree.text_content()
+
+def _html_to_text_bs4(content):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'html.parser')
+    # Remove script and style elements
+    for script in soup(["script", "style", "meta", "link"]):
+        script.decompose()
+    return soup.get_text()
+
+# Available HTML-to-text backends; "auto" uses lxml when installed
+HTML_TEXT_BACKENDS = {
+    'stdlib': _html_to_text_stdlib,
+    'lxml': _html_to_text_lxml,
+    'bs4': _html_to_text_bs4,
+}
+
+def html_to_text(content, backend='auto'):
+    """Extract the text of an HTML fragment with the given backend."""
+    if backend == 'auto' or (backend == 'lxml' and not _lxml_available()):
+        backend = 'lxml' if _lxml_available() else 'stdlib'
+    return HTML_TEXT_BACKENDS[backend](content)
+
+def summarize_content(content, stop_words=None, html_backend='auto', sentence_splitter='builtin'):
+    """Summarize an entry's HTML content into a short TL;DR.
+
+    Picks the three sentences with the highest average word frequency and
+    returns them in their original order, cut to 30 words. Sentences are
+    split by split_sentences(), or by NLTK's sent_tokenize when
+    sentence_splitter is "nltk".
+    """
+    try:
+        if not content:
+            return None
+
+        if stop_words is None:
+            stop_words = _get_stop_words(sentence_splitter)
+
+        # Get the text of the HTML with whitespace collapsed
+        text = ' '.join(html_to_text(content, html_backend).split())
+
+        # Remove common unwanted phrases, then clean up any double spaces and trim
+        words = _UNWANTED_PHRASES_RE.sub('', text).split()
+        text = ' '.join(words)
+
+        # If text is too short, return it as is
+        if len(words) < 50:
+            return text[:500] + "..." if len(text) > 500 else text
+
+        sentences = None
+        if sentence_splitter == 'nltk':
+            try:
+                from nltk.tokenize import sent_tokenize
+                sentences = sent_tokenize(text)
+            except (ImportError, LookupError):
+                # Fall back to the built-in splitter if NLTK or its data is not installed
+                pass
+        if sentences is None:
+            sentences = split_sentences(text)
+
+        # Tokenize each distinct sentence once, keeping its first position
+        sentence_words = {}
+        for sentence in sentences:
+            if sentence not in sentence_words:
+                sentence_words[sentence] = sentence.lower().split()
+        tokenized = list(sentence_words.items())
+
+        # Calculate word frequencies
+        word_frequencies = defaultdict(int)
+        for _, words in tokenized:
+            for word in words:
+                if word not in stop_words and word not in string.punctuation:
+                    word_frequencies[word] += 1
+
+        # Normalize word frequencies
+        max_frequency = max(word_frequencies.values()) if word_frequencies else 1
+        word_frequencies = {word: count / max_frequency for word, count in word_frequencies.items()}
+
+        # Score sentences by their average normalized word frequency
+        scores = []
+        for index, (_, words) in enumerate(tokenized):
+            score = 0.0
+            for word in words:
+                if word in word_frequencies:
+                    score += word_frequencies[word]
+            scores.append((score / (len(words) or 1), index))
+
+        # Get top 3 sentences, earlier sentences first on ties, in their original order
+        top_indices = sorted(index for _, index in sorted(scores, key=lambda x: x[0], reverse=True)[:3])
+        summary = ' '.join(tokenized[index][0] for index in top_indices)
+
+        # Limit to 30 words
+        words = summary.split()
+        if len(words) > 30:
+            return ' '.join(words[:30]) + '...'
+        return summary
+
+    except Exception as e:
+        logging.error(f"Error in summarize_content: {str(e)}")
+        # Fallback to simple extraction
+        try:
+            words = text.split()
+            return ' '.join(words[:30]) + '...'
+        except:
+            return None
+
+class EntryDateResolver:
+    """Finds the publish dates of a feed's entries.
+
+    The feedparser *_parsed fields are tried first, in PARSED_FIELDS order,
+    then the string fields with datetime.fromisoformat,
+    email.utils.parsedate_to_datetime and finally strptime with DATE_FORMATS.
+    Feeds use one format for all their entries, so the string field and
+    method that worked last (the hint) is tried first for that field. The
+    hint only changes the order of the attempts on a field, never which field
+    is used, so an entry gets the same date with or without it. Dates are
+    returned timezone-aware, in UTC when the feed does not say otherwise.
+    """
+
+    PARSED_FIELDS = (
+        'published_parsed', 'updated_parsed', 'created_parsed', 'modified_parsed', 'date_parsed',
+        'pubDate_parsed', 'dc:date_parsed', 'dc:created_parsed', 'dc:modified_parsed',
+    )
+    STRING_FIELDS = (
+        'published', 'updated', 'created', 'modified', 'date', 'pubDate', 'dc:date', 'dc:created', 'dc:modified',
+    )
+    # Formats fromisoformat and parsedate_to_datetime do not cover; fromisoformat
+    # only accepts "+0000" offsets from Python 3.11
+    DATE_FORMATS = (
+        '%Y-%m-%dT%H:%M:%S%z',
+        '%Y-%m-%d %H:%M:%S%z',
+        '%d %b %Y %H:%M:%S %z',
+        '%d %b %Y %H:%M:%S',
+        '%a, %d %b %Y %H:%M',
+    )
+    _ID_DATE_RE = re.compile(r'(\d{4})[-/](\d{2})[-/](\d{2})')
+
+    def __init__(self, hint=None):
+        # "field\tmethod", where method is iso, rfc822, id or a strptime format
+        self.hint = hint
+
+    @staticmethod
+    def _aware(value):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+    def _parse(self, entry, field, method):
+        """Read field of entry with method, returning an aware datetime or None."""
+        if method == 'id':
+            match = self._ID_DATE_RE.search(entry.get('id') or '')
+            return datetime(*map(int, match.groups()), tzinfo=timezone.utc) if match else None
+        value = entry.get(field)
+        if not value:
+            return None
+        if method == 'parsed':
+            return datetime(*value[:6], tzinfo=timezone.utc)
+        value = value.strip()
+        if method == 'iso':
+            # Python before 3.11 does not accept a "Z" suffix
+            return self._aware(datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value))
+        if method == 'rfc822':
+            return self._aware(email.utils.parsedate_to_datetime(value))
+        return self._aware(datetime.strptime(value, method))
+
+    def _candidates(self, entry):
+        """Yield the (field, method) pairs to try for entry, in priority order."""
+        hint_field, hint_method = self.hint.split('\t', 1) if self.hint else (None, None)
+        for field in self.PARSED_FIELDS:
+            if entry.get(field):
+                yield field, 'parsed'
+        for field in self.STRING_FIELDS:
+            if entry.get(field):
+                methods = ['iso', 'rfc822', *self.DATE_FORMATS]
+                if field == hint_field and hint_method in methods:
+                    methods.remove(hint_method)
+                    methods.insert(0, hint_method)
+                for method in methods:
+                    yield field, method
+        # Some feeds include the date in their entry IDs
+        yield 'id', 'id'
+
+    def resolve(self, entry):
+        """Find the publish date of a feedparser entry, or None if it has none."""
+        for field, method in self._candidates(entry):
+            try:
+                published = self._parse(entry, field, method)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                continue
+            if published is not None:
+                if method != 'parsed':
+                    self.hint = f"{field}\t{method}"
+                return published
+        return None
+
+# Map common tag names to our categories based on channel type
+CATEGORY_TAG_MAPPING = {
+    'engineering': {
+        'go': 'web',
+        'golang': 'web',
+        'python': 'web',
+        'javascript': 'web',
+        'java': 'web',
+        'ruby': 'web',
+        'php': 'web',
+        'rust': 'web',
+        'c++': 'web',
+        'c#': 'web',
+        'dotnet': 'web',
+        'node': 'web',
+        'react': 'web',
+        'angular': 'web',
+        'vue': 'web',
+        'django': 'web',
+        'flask': 'web',
+        'spring': 'web',
+        'rails': 'web',
+        'laravel': 'web',
+        'express': 'web',
+        'nextjs': 'web',
+        'nuxt': 'web',
+        'svelte': 'web',
+        'typescript': 'web',
+        'swift': 'mobile',
+        'kotlin': 'mobile',
+        'android': 'mobile',
+        'ios': 'mobile',
+        'flutter': 'mobile',
+        'reactnative': 'mobile',
+        'xamarin': 'mobile',
+        'unity': 'game',
+        'unreal': 'game',
+        'godot': 'game',
+        'gamedev': 'game',
+        'gaming': 'game',
+        'ai': 'ai',
+        'machine-learning': 'ai',
+        'ml': 'ai',
+        'artificial-intelligence': 'ai',
+        'deep-learning': 'ai',
+        'neural-networks': 'ai',
+        'tensorflow': 'ai',
+        'pytorch': 'ai',
+        'cloud': 'cloud',
+        'aws': 'cloud',
+        'azure': 'cloud',
+        'gcp': 'cloud',
+        'kubernetes': 'cloud',
+        'docker': 'cloud',
+        'devops': 'cloud',
+        'database': 'database',
+        'sql': 'database',
+        'nosql': 'database',
+        'mongodb': 'database',
+        'postgresql': 'database',
+        'mysql': 'database',
+        'redis': 'database',
+        'security': 'security',
+        'cybersecurity': 'security',
+        'hacking': 'security',
+        'privacy': 'security',
+        'design': 'design',
+        'ui': 'design',
+        'ux': 'design',
+        'frontend': 'design',
+        'css': 'design',
+        'html': 'design',
+        'tutorial': 'tutorial',
+        'how-to': 'tutorial',
+        'guide': 'tutorial',
+        'learning': 'tutorial',
+        'application': 'web',
+        'app': 'web',
+        'development': 'web',
+        'developer': 'web',
+        'engineering': 'web',
+        'software': 'web',
+        'programming': 'web',
+        'code': 'web',
+        'architecture': 'architecture',
+        'architect': 'architecture',
+        'design-pattern': 'architecture',
+        'design-patterns': 'architecture',
+        'system-design': 'architecture',
+        'microservices': 'architecture',
+        'distributed-systems': 'architecture',
+        'scalability': 'architecture',
+        'performance': 'architecture',
+        'clean-code': 'architecture',
+        'clean-architecture': 'architecture',
+        'ddd': 'architecture',
+        'domain-driven-design': 'architecture'
+    },
+    'data_analytics': {
+        'data-engineering': 'data_engineering',
+        'data-science': 'data_science',
+        'analytics': 'analytics',
+        'bi': 'analytics',
+        'business-intelligence': 'analytics',
+        'machine-learning': 'ml',
+        'ml': 'ml',
+        'artificial-intelligence': 'ai',
+        'ai': 'ai',
+        'big-data': 'big_data',
+        'data-quality': 'data_quality',
+        'data-governance': 'data_governance',
+        'data-visualization': 'data_visualization',
+        'etl': 'data_engineering',
+        'data-pipeline': 'data_engineering',
+        'data-warehouse': 'data_engineering',
+        'data-lake': 'big_data',
+        'data-modeling': 'data_engineering',
+        'data-architecture': 'data_engineering',
+        'data-strategy': 'data_governance',
+        'data-security': 'data_governance',
+        'data-privacy': 'data_governance',
+        'data-ethics': 'data_governance',
+        'data-ops': 'data_engineering',
+        'data-mesh': 'data_architecture',
+        'data-fabric': 'data_architecture',
+        'data-catalog': 'data_governance',
+        'data-lineage': 'data_governance',
+        'data-observability': 'data_quality',
+        'data-testing': 'data_quality',
+        'data-validation': 'data_quality',
+        'data-profiling': 'data_quality',
+        'data-monitoring': 'data_quality',
+        'data-analytics': 'analytics',
+        'data-visualization': 'data_visualization',
+        'data-storytelling': 'data_visualization',
+        'data-dashboard': 'data_visualization',
+        'data-reporting': 'analytics',
+        'data-metrics': 'analytics',
+        'data-kpis': 'analytics',
+        'data-insights': 'analytics',
+        'data-discovery': 'analytics',
+        'data-exploration': 'analytics',
+        'data-mining': 'data_science',
+        'data-analysis': 'data_science',
+        'data-science': 'data_science',
+        'data-scientist': 'data_science',
+        'data-engineer': 'data_engineering',
+        'data-analyst': 'analytics',
+        'data-architect': 'data_architecture',
+        'data-governance': 'data_governance',
+        'data-quality': 'data_quality',
+        'data-visualization': 'data_visualization'
+    },
+    'management': {
+        'leadership': {
+            'primary': ['leadership', 'leadership development', 'leadership skills', 'leadership style', 'leadership qualities'],
+            'secondary': ['executive', 'management style', 'leadership role', 'leadership position'],
+            'exclude': ['engineering', 'technical', 'software', 'development', 'kubernetes', 'container', 'cloud', 'infrastructure']
+        },
+        'team_management': {
+            'primary': ['team management', 'team building', 'team collaboration'],
+            'secondary': ['team leadership', 'team development']
+        },
+        'product_management': {
+            'primary': ['product management', 'product development', 'product strategy'],
+            'secondary': ['product innovation', 'product planning']
+        },
+        'project_management': {
+            'primary': ['project management', 'project planning', 'project execution'],
+            'secondary': ['project delivery', 'project methodology']
+        },
+        'agile': {
+            'primary': ['agile', 'scrum', 'agile development', 'agile transformation'],
+            'secondary': ['sprint', 'kanban', 'agile methodology']
+        },
+        'strategy': {
+            'primary': ['strategy', 'strategic planning', 'business strategy'],
+            'secondary': ['strategic thinking', 'strategic management']
+        },
+        'innovation': {
+            'primary': ['innovation', 'business innovation', 'innovation management'],
+            'secondary': ['innovative thinking', 'innovation strategy']
+        },
+        'culture': {
+            'primary': ['culture', 'company culture', 'organizational culture'],
+            'secondary': ['workplace culture', 'cultural transformation']
+        },
+        'career': {
+            'primary': ['career', 'career development', 'career growth'],
+            'secondary': ['professional development', 'career planning']
+        }
+    }
+}
+
+# Define keywords for each category based on channel type
+CATEGORY_KEYWORDS = {
+    'engineering': {
+        'tutorial': {
+            'primary': ['tutorial', 'guide', 'how to', 'learn', 'step by step', 'hands-on'],
+            'secondary': ['example', 'demo', 'walkthrough']
+        },
+        'bug': {
+            'primary': ['bug fix', 'issue fix', 'problem fix', 'error fix', 'debug'],
+            'secondary': ['bug', 'issue', 'problem', 'error', 'debug']
+        },
+        'security': {
+            'primary': ['security', 'vulnerability', 'exploit', 'hack', 'breach', 'cyber'],
+            'secondary': ['secure', 'protect', 'defense']
+        },
+        'release': {
+            'primary': ['release', 'update', 'version', 'new feature', 'announcement'],
+            'secondary': ['launch', 'deploy']
+        },
+        'ai': {
+            'primary': ['artificial intelligence', 'machine learning', 'neural network', 'deep learning'],
+            'secondary': ['ai model', 'ml model', 'neural', 'deep learning']
+        },
+        'cloud': {
+            'primary': ['cloud', 'aws', 'azure', 'gcp', 'infrastructure'],
+            'secondary': ['serverless', 'kubernetes', 'docker']
+        },
+        'database': {
+            'primary': ['database', 'sql', 'nosql', 'storage', 'query', 'elasticsearch'],
+            'secondary': ['db', 'data store', 'cache'],
+            'exclude': ['search', 'application', 'development', 'engineering', 'software']
+        },
+        'mobile': {
+            'primary': ['mobile', 'ios', 'android', 'app', 'smartphone'],
+            'secondary': ['flutter', 'react native', 'swift', 'kotlin']
+        },
+        'web': {
+            'primary': ['web', 'frontend', 'backend', 'javascript', 'react', 'angular', 'application', 'development', 'engineering', 'software'],
+            'secondary': ['api', 'server', 'client', 'browser', 'programming', 'code']
+        },
+        'game': {
+            'primary': ['game', 'gaming', 'unity', 'unreal', '3d'],
+            'secondary': ['game engine', 'graphics', 'physics']
+        },
+        'design': {
+            'primary': ['design', 'ui', 'ux', 'interface', 'user experience'],
+            'secondary': ['layout', 'wireframe', 'prototype']
+        },
+        'architecture': {
+            'primary': ['architecture', 'architect', 'design pattern', 'system design', 'microservices', 'distributed systems', 'scalability', 'clean architecture', 'domain driven design', 'ddd'],
+            'secondary': ['pattern', 'design principles', 'best practices', 'performance', 'scaling', 'high availability', 'fault tolerance', 'resilience']
+        }
+    },
+    'data_analytics': {
+        'data_engineering': {
+            'primary': ['data engineering', 'etl', 'data pipeline', 'data warehouse', 'data modeling'],
+            'secondary': ['data ops', 'data mesh', 'data fabric']
+        },
+        'data_science': {
+            'primary': ['data science', 'data mining', 'data analysis', 'statistical analysis'],
+            'secondary': ['predictive modeling', 'data scientist']
+        },
+        'analytics': {
+            'primary': ['analytics', 'business intelligence', 'bi', 'data analytics'],
+            'secondary': ['reporting', 'metrics', 'kpis', 'insights']
+        },
+        'ml': {
+            'primary': ['machine learning', 'ml', 'predictive analytics'],
+            'secondary': ['model training', 'model deployment']
+        },
+        'ai': {
+            'primary': ['artificial intelligence', 'ai', 'deep learning'],
+            'secondary': ['neural networks', 'cognitive computing']
+        },
+        'big_data': {
+            'primary': ['big data', 'data lake', 'hadoop', 'spark'],
+            'secondary': ['distributed computing', 'data processing']
+        },
+        'data_quality': {
+            'primary': ['data quality', 'data testing', 'data validation'],
+            'secondary': ['data profiling', 'data monitoring']
+        },
+        'data_governance': {
+            'primary': ['data governance', 'data strategy', 'data security'],
+            'secondary': ['data privacy', 'data ethics']
+        },
+        'data_visualization': {
+            'primary': ['data visualization', 'data storytelling', 'dashboard'],
+            'secondary': ['charts', 'graphs', 'reports']
+        }
+    },
+    'management': {
+        'leadership': {
+            'primary': ['leadership', 'leadership development', 'leadership skills', 'leadership style', 'leadership qualities'],
+            'secondary': ['executive', 'management style', 'leadership role', 'leadership position'],
+            'exclude': ['engineering', 'technical', 'software', 'development', 'kubernetes', 'container', 'cloud', 'infrastructure']
+        },
+        'team_management': {
+            'primary': ['team management', 'team building', 'team collaboration'],
+            'secondary': ['team leadership', 'team development']
+        },
+        'product_management': {
+            'primary': ['product management', 'product development', 'product strategy'],
+            'secondary': ['product innovation', 'product planning']
+        },
+        'project_management': {
+            'primary': ['project management', 'project planning', 'project execution'],
+            'secondary': ['project delivery', 'project methodology']
+        },
+        'agile': {
+            'primary': ['agile', 'scrum', 'agile development', 'agile transformation'],
+            'secondary': ['sprint', 'kanban', 'agile methodology']
+        },
+        'strategy': {
+            'primary': ['strategy', 'strategic planning', 'business strategy'],
+            'secondary': ['strategic thinking', 'strategic management']
+        },
+        'innovation': {
+            'primary': ['innovation', 'business innovation', 'innovation management'],
+            'secondary': ['innovative thinking', 'innovation strategy']
+        },
+        'culture': {
+            'primary': ['culture', 'company culture', 'organizational culture'],
+            'secondary': ['workplace culture', 'cultural transformation']
+        },
+        'career': {
+            'primary': ['career', 'career development', 'career growth'],
+            'secondary': ['professional development', 'career planning']
+        }
+    }
+}
+
+# Categories preferred on a score tie, per channel type
+CATEGORY_PRIORITY = {
+    'engineering': ['tutorial', 'web', 'cloud', 'database', 'ai', 'security', 'release', 'bug',
+                    'mobile', 'game', 'design', 'architecture'],
+    'data_analytics': ['data_engineering', 'data_science', 'analytics', 'ml', 'ai', 'big_data',
+                       'data_quality', 'data_governance', 'data_visualization'],
+    'management': ['leadership', 'team_management', 'product_management', 'project_management',
+                   'agile', 'strategy', 'innovation', 'culture', 'career'],
+}
+
+class KeywordMatcher:
+    """Find which of a fixed set of keywords occur in a text in a single pass.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed. Otherwise
+    the keywords are compiled into one regex trie inside a lookahead, which
+    reports the longest keyword starting at every position; the shorter ones
+    starting there are its prefixes. Both give the same answers as a plain
+    substring test per keyword.
+    """
+
+    def __init__(self, keywords):
+        keywords = sorted(set(keywords))
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+            return
+
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        self._pattern = re.compile(f'(?=({self._trie_regex(trie)}))')
+        self._prefixes = {keyword: [other for other in keywords if keyword.startswith(other)] for keyword in keywords}
+
+    @classmethod
+    def _trie_regex(cls, node):
+        branches = [re.escape(char) + cls._trie_regex(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if '' in node:
+            # A keyword ends here; prefer the longer keywords below it
+            return f"(?:{pattern})?"
+        return pattern
+
+    def find(self, text):
+        """Return the set of keywords that occur anywhere in text."""
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        found = set()
+        for keyword in set(self._pattern.findall(text)):
+            found.update(self._prefixes[keyword])
+        return found
+
+@functools.lru_cache(maxsize=None)
+def _get_category_matcher(channel_type):
+    """Compile the keyword matcher of a channel type on first use."""
+    keywords = []
+    for keyword_sets in CATEGORY_KEYWORDS[channel_type].values():
+        for key in ('primary', 'secondary', 'exclude'):
+            keywords.extend(keyword_sets.get(key, []))
+    return KeywordMatcher(keywords)
+
+def classify_entry(channel_type, feed_name, title, content, tags):
+    """Pick the category of an entry for channel_type from its tags and keywords."""
+    # First try to get category from feed tags
+    if tags:
+        # Get the appropriate tag mapping based on the channel type
+        current_tag_mapping = CATEGORY_TAG_MAPPING.get(channel_type, CATEGORY_TAG_MAPPING['engineering'])
+
+        # Check each tag
+        for tag in tags:
+            # Clean up the tag term
+            tag_term = tag.lower().strip()
+            if tag_term.startswith('cdata[') and tag_term.endswith(']'):
+                tag_term = tag_term[6:-1].strip()
+
+            if tag_term in current_tag_mapping:
+                return current_tag_mapping[tag_term]
+
+            # Try splitting compound tags (e.g., "Web Development" -> ["web", "development"])
+            for word in tag_term.split():
+                if word in current_tag_mapping:
+                    return current_tag_mapping[word]
+
+    # If no tags found or no matching tags, fall back to keyword-based categorization
+    text = f"{feed_name} {title} {content}".lower()
+
+    # Get the appropriate keywords based on the channel type
+    keyword_channel_type = channel_type if channel_type in CATEGORY_KEYWORDS else 'engineering'
+    current_keywords = CATEGORY_KEYWORDS[keyword_channel_type]
+
+    # Find every keyword of the channel type in a single pass over the text
+    found = _get_category_matcher(keyword_channel_type).find(text)
+
+    # Score each category
+    category_scores = {}
+    for category, keyword_sets in current_keywords.items():
+        if category == 'default':
+            continue
+
+        score = 0
+        # Check primary keywords (higher weight)
+        for keyword in keyword_sets['primary']:
+            if keyword in found:
+                score += 2
+        # Check secondary keywords (lower weight)
+        for keyword in keyword_sets['secondary']:
+            if keyword in found:
+                score += 1
+
+        # Apply exclusion rules
+        if any(keyword in found for keyword in keyword_sets.get('exclude', [])):
+            score = 0
+
+        category_scores[category] = score
+
+    # Get the category with the highest score
+    if category_scores:
+        max_score = max(category_scores.values())
+        if max_score > 0:
+            # Get all categories with the max score
+            top_categories = [cat for cat, score in category_scores.items() if score == max_score]
+            # If there's a tie, prefer certain categories based on channel type
+            priority_order = CATEGORY_PRIORITY.get(channel_type, CATEGORY_PRIORITY['management'])
+            for category in priority_order:
+                if category in top_categories:
+                    return category
+
+    return 'default'
+
+def summary_cache_key(entry, html_backend='auto', sentence_splitter='builtin'):
+    """Hash everything the TL;DR of an entry record depends on."""
+    digest = hashlib.sha256()
+    for part in (SUMMARIZER_VERSION, html_backend, sentence_splitter, entry['content'] or ''):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'source', 'sr_share', 'igshid'}
+# Query parameters through which redirectors pass on the target URL
+REDIRECT_PARAMS = ('url', 'u', 'q', 'target', 'dest', 'destination', 'redirect', 'redirect_url')
+
+_WORD_RE = re.compile(r'\w+')
+_TAG_RE = re.compile(r'<[^>]*>')
+
+# SimHash settings: fingerprints differing in at most SIMHASH_BANDS - 1 bits
+# share at least one band exactly, which is what the index looks up. 16-bit
+# bands keep the candidates of a lookup to about 4 rows per 65536 stored
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_MIN_WORDS = 8
+
+def canonicalize_link(link):
+    """Canonicalize an article link so the same article matches across feeds.
+
+    Redirector links are unwrapped to their target, the scheme, host and
+    "www." prefix are normalized, and tracking parameters, the fragment and a
+    trailing slash are dropped. The remaining query parameters are sorted.
+    """
+    if not link:
+        return None
+    parsed = urlparse(link.strip())
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return link.strip()
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    for name, value in query:
+        if name.lower() in REDIRECT_PARAMS and value.startswith(('http://', 'https://')):
+            return canonicalize_link(value)
+    query = sorted(
+        (name, value) for name, value in query
+        if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS
+    )
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return parsed._replace(scheme='https', netloc=host, path=parsed.path.rstrip('/'),
+                           params='', query=urlencode(query), fragment='').geturl()
+
+def simhash(text):
+    """Compute the 64-bit SimHash of text's words, or None if text is too short.
+
+    The result is a signed integer so it can be stored in SQLite.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SIMHASH_MIN_WORDS:
+        return None
+    counts = [0] * SIMHASH_BITS
+    for word in words:
+        value = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(SIMHASH_BITS):
+            counts[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+    return fingerprint - (1 << SIMHASH_BITS) if fingerprint >= 1 << (SIMHASH_BITS - 1) else fingerprint
+
+def simhash_bands(fingerprint):
+    """Split a SimHash into SIMHASH_BANDS unsigned bands for the banded index."""
+    fingerprint &= (1 << SIMHASH_BITS) - 1
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    return [fingerprint >> (band * width) & ((1 << width) - 1) for band in range(SIMHASH_BANDS)]
+
+def simhash_distance(a, b):
+    """Count the bits that differ between two SimHash fingerprints."""
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count('1')
+
+def entry_fingerprint(title, content):
+    """SimHash the title and the start of the summary text of an entry."""
+    text = _TAG_RE.sub(' ', (content or '')[:4000])
+    return simhash(f"{title} {html.unescape(text)}")
+
+class FingerprintIndex:
+    """In-memory index of entry fingerprints by canonical link and SimHash band."""
+
+    def __init__(self):
+        self._links = defaultdict(list)
+        self._bands = defaultdict(list)
+
+    def add(self, key, link, fingerprint):
+        """Index the entry with key, a (feed_name, entry_id) pair."""
+        if link:
+            self._links[link].append(key)
+        if fingerprint is not None:
+            for band, value in enumerate(simhash_bands(fingerprint)):
+                self._bands[band, value].append((key, fingerprint))
+
+    def match(self, key, link, fingerprint, max_distance):
+        """Find an entry other than key with the same link, or a SimHash from another feed within max_distance bits.
+
+        Returns its (feed_name, entry_id), or None.
+        """
+        for other in self._links.get(link, ()) if link else ():
+            if other != key:
+                return other
+        if fingerprint is None:
+            return None
+        for band, value in enumerate(simhash_bands(fingerprint)):
+            for other, other_fingerprint in self._bands.get((band, value), ()):
+                # Entries of one feed often share a boilerplate summary
+                if other[0] != key[0] and simhash_distance(fingerprint, other_fingerprint) <= max_distance:
+                    return other
+        return None
+
+def fingerprint_entries(texts):
+    """SimHash a list of (title, content) pairs.
+
+    Runs in the worker pool.
+    """
+    return [entry_fingerprint(title, content) for title, content in texts]
+
+def feed_poll_hints(feed):
+    """Read the polling hints a feed publishes.
+
+    Returns (ttl, update_interval) in seconds, each None if absent: the RSS
+    <ttl> the feed may be cached for, and the interval implied by the
+    syndication module's sy:updatePeriod and sy:updateFrequency.
+    """
+    ttl = None
+    try:
+        ttl = int(feed.get('ttl')) * 60 or None
+    except (TypeError, ValueError):
+        pass
+    update_interval = None
+    period = UPDATE_PERIOD_SECONDS.get(str(feed.get('sy_updateperiod', '')).strip().lower())
+    if period:
+        try:
+            frequency = max(1, int(feed.get('sy_updatefrequency', 1)))
+        except (TypeError, ValueError):
+            frequency = 1
+        update_interval = period / frequency
+    return ttl, update_interval
+
+def estimate_poll_interval(timestamps, hints, min_interval, max_interval, now=None):
+    """Estimate how often a feed should be polled from its entries' publish times.
+
+    Polls about twice per median gap between recent entries, slower when the
+    newest entry is long overdue. The syndication update interval (or the
+    ttl) is used if there are too few dated entries, and the feed's ttl is a
+    lower bound.
+    Returns None if nothing is known about the feed.
+    """
+    now = time.time() if now is None else now
+    ttl, update_interval = hints
+    dated = sorted((timestamp for timestamp in timestamps if timestamp is not None), reverse=True)[:20]
+    gaps = sorted(newer - older for newer, older in zip(dated, dated[1:]) if newer > older)
+    if gaps:
+        median_gap = gaps[len(gaps) // 2]
+        interval = median_gap / 2
+        # A feed that has not published for many gaps is probably dormant
+        overdue = now - dated[0]
+        if overdue > 4 * median_gap:
+            interval = max(interval, overdue / 4)
+    elif update_interval or ttl:
+        interval = update_interval or ttl
+    else:
+        return None
+    if ttl:
+        interval = max(interval, ttl)
+    return min(max(interval, min_interval), max_interval)
+
+class PollScheduler:
+    """Priority queue of items ordered by their next poll time."""
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, when, item):
+        """Schedule item to be polled at the unix time when."""
+        heapq.heappush(self._heap, (when, next(self._counter), item))
+
+    def next_time(self):
+        """The unix time of the earliest scheduled poll, or None if nothing is scheduled."""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now, window=0):
+        """Remove and return the items due by now + window, earliest first."""
+        due = []
+        while self._heap and self._heap[0][0] <= now + window:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+def parse_feed_entries(content, date_hint=None):
+    """Parse a feed body into plain entry records and the feed's polling hints.
+
+    Runs in the worker pool, so the records only hold picklable values.
+    date_hint is the EntryDateResolver hint learned from the feed before.
+    Returns (records, hints, date_hint) with hints as returned by
+    feed_poll_hints() and the date hint that worked for this body.
+    """
+    import feedparser
+    feed_data = feedparser.parse(content)
+    date_resolver = EntryDateResolver(date_hint)
+    feed_title = feed_data.feed.get('title', 'Unknown')
+    records = []
+    for entry in feed_data.entries:
+        published_parsed = entry.get('published_parsed')
+        records.append({
+            'id': entry.get('id', entry.get('link', '')),
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'feed_title': feed_title,
+            'published': tuple(published_parsed[:6]) if published_parsed else None,
+            'timestamp': _entry_timestamp(entry),
+            'date': date_resolver.resolve(entry),
+            'content': _entry_content(entry),
+            'tags': _entry_tags(entry),
+            # The SimHash is only computed for the entries that turn out to be new
+            'canonical_link': canonicalize_link(entry.get('link', '')),
+        })
+    return records, feed_poll_hints(feed_data.feed), date_resolver.hint
+
+def summarize_entries(records, html_backend='auto', sentence_splitter='builtin'):
+    """Add the TL;DR to each entry record.
+
+    Runs in the worker pool. The time spent is returned in the record's
+    "timings", since a process pool cannot record it in the run stats.
+    Entries are not classified: the posted messages are grouped by feed,
+    not by category.
+    """
+    for record in records:
+        start = time.perf_counter()
+        record['tldr'] = summarize_content(record['content'], html_backend=html_backend,
+                                          sentence_splitter=sentence_splitter)
+        record['timings'] = {'tldr': time.perf_counter() - start}
+    return records
+
+# Base URL of the Discord HTTP API used by the REST posting mode
+DISCORD_API_BASE = 'https://discord.com/api/v10'
+
+# Discord message limits used when packing entries into embeds
+DISCORD_MAX_EMBEDS = 10             # embeds per message
+DISCORD_MAX_EMBED_CHARS = 6000      # characters across all embeds of a message
+DISCORD_MAX_DESCRIPTION = 4096      # characters in one embed description
+DISCORD_MAX_TITLE = 256             # characters in one embed title
+
+# Embeds are kept as Discord API embed dicts, so only the gateway mode imports discord.py
+DISCORD_BLUE = 0x3498db             # discord.Color.blue()
+
+def _embed_length(embed):
+    """Count the characters of an embed dict toward DISCORD_MAX_EMBED_CHARS."""
+    return len(embed.get('title') or '') + len(embed.get('description') or '')
+
+class EmbedPacker:
+    """Packs sections of entry texts into as few messages as Discord's limits allow.
+
+    Each section gets its own embeds; embeds share messages up to
+    DISCORD_MAX_EMBEDS and DISCORD_MAX_EMBED_CHARS. Entries keep their order
+    and never span two embeds; a section continued in another embed gets a
+    "(continued)" title. The optional header embed opens the first message.
+
+    Embeds are Discord API embed dicts. Sections can be added as they become ready: add_section returns the
+    messages that are already full, finish the last one. Each message is an
+    (embeds, keys) pair, where keys lists the keys of the entries it holds.
+    """
+
+    def __init__(self, header=None, color=None):
+        self.color = color
+        self._embeds = [header] if header is not None else []
+        self._keys = []
+        self._total = _embed_length(header) if header is not None else 0
+
+    def add_section(self, title, entry_texts, entry_keys=None):
+        """Add a section, returning the (embeds, keys) messages completed by it."""
+        messages = []
+        embed = None
+        if entry_keys is None:
+            entry_keys = [None] * len(entry_texts)
+        for text, key in zip(entry_texts, entry_keys):
+            text = text[:DISCORD_MAX_DESCRIPTION]
+            if (embed is not None and len(embed['description']) + len(text) <= DISCORD_MAX_DESCRIPTION
+                    and self._total + len(text) <= DISCORD_MAX_EMBED_CHARS):
+                embed['description'] += text
+                self._total += len(text)
+            else:
+                # Start a new embed, in a new message if this one is full
+                embed_title = (title if embed is None else f"{title} (continued)")[:DISCORD_MAX_TITLE]
+                if self._embeds and (len(self._embeds) >= DISCORD_MAX_EMBEDS
+                                     or self._total + len(embed_title) + len(text) > DISCORD_MAX_EMBED_CHARS):
+                    messages.append((self._embeds, self._keys))
+                    self._embeds = []
+                    self._keys = []
+                    self._total = 0
+                embed = {'title': embed_title, 'description': text, 'color': self.color}
+                self._embeds.append(embed)
+                self._total += len(embed_title) + len(text)
+            if key is not None:
+                self._keys.append(key)
+        return messages
+
+    def finish(self):
+        """Return the last, partly filled messages."""
+        messages = [(self._embeds, self._keys)] if self._embeds else []
+        self._embeds = []
+        self._keys = []
+        self._total = 0
+        return messages
+
+class DiscordAPIError(Exception):
+    """An error response from the Discord HTTP API."""
+
+    def __init__(self, status, text):
+        super().__init__(f"Discord API returned {status}: {text}")
+        self.status = status
+
+class DiscordRateLimiter:
+    """Tracks Discord's rate-limit buckets from the X-RateLimit-* response headers.
+
+    Requests to a route wait while its bucket has no requests remaining, and
+    every route waits while a global rate limit is in effect.
+    """
+
+    def __init__(self, stats=None):
+        self._route_buckets = {}    # route -> bucket id reported by Discord
+        self._buckets = {}          # bucket id -> [remaining, monotonic reset time]
+        self._global_reset = 0.0
+        self.stats = stats
+
+    async def acquire(self, route, name=None):
+        """Wait until a request to route is allowed, and count it against its bucket.
+
+        Routes can be webhook URLs with the token in them, so log messages use
+        name and the bucket id instead of the route.
+        """
+        while True:
+            now = time.monotonic()
+            delay = self._global_reset - now
+            bucket = self._buckets.get(self._route_buckets.get(route, route))
+            if bucket and bucket[0] <= 0:
+                delay = max(delay, bucket[1] - now)
+            if delay <= 0:
+                break
+            bucket_id = self._route_buckets.get(route, 'unknown')
+            logging.info(f"Rate limited on {name or 'Discord route'} (bucket {bucket_id}), waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+            if self.stats:
+                self.stats.record('rate_limit_wait', delay)
+        # the bucket may have reset while waiting, so compare with the time now
+        if bucket and bucket[1] > time.monotonic():
+            bucket[0] -= 1
+
+    def update(self, route, headers):
+        """Record the bucket state reported in a response's headers."""
+        bucket_id = headers.get('X-RateLimit-Bucket')
+        if bucket_id:
+            self._route_buckets[route] = bucket_id
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is not None and reset_after is not None:
+            self._buckets[bucket_id or route] = [int(remaining), time.monotonic() + float(reset_after)]
+
+    def rate_limited(self, route, headers, retry_after):
+        """Block the route's bucket, or every route for a global limit, after a 429."""
+        reset = time.monotonic() + retry_after
+        if headers.get('X-RateLimit-Global') == 'true' or headers.get('X-RateLimit-Scope') == 'global':
+            self._global_reset = reset
+        else:
+            self._buckets[self._route_buckets.get(route, route)] = [0, reset]
+
+class RESTChannel:
+    """A Discord channel posted to over the HTTP API, without a gateway connection.
+
+    Messages go to the channel's webhook when one is configured, otherwise
+    to the channel itself with the bot token.
+    """
+
+    USER_AGENT = 'DiscordBot (https://github.com/sugamax/rss-discord-bot, 1.0)'
+
+    def __init__(self, session, channel_id, token=None, webhook_url=None, api_base=DISCORD_API_BASE,
+                 rate_limiter=None, timeout=30.0):
+        self.id = int(channel_id)
+        self._session = session
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._rate_limiter = rate_limiter or DiscordRateLimiter()
+        self.headers = {'User-Agent': self.USER_AGENT}
+        if webhook_url:
+            # wait=true makes Discord confirm the message instead of answering 204;
+            # keep the query the webhook URL already has, such as thread_id
+            parsed = urlparse(webhook_url)
+            query = [(name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True) if name != 'wait']
+            self.url = parsed._replace(query=urlencode([*query, ('wait', 'true')])).geturl()
+        else:
+            self.url = f"{api_base.rstrip('/')}/channels/{self.id}/messages"
+            self.headers['Authorization'] = f"Bot {token}"
+
+    async def send(self, content=None, embed=None, embeds=None):
+        """Post a message and return the created message object.
+
+        Waits out rate limits and repeats the request after a 429. The timeout
+        applies to each request, not to the time spent waiting for the rate limit.
+        """
+        if embed is not None:
+            embeds = [embed]
+        payload = {}
+        if content is not None:
+            payload['content'] = content
+        if embeds:
+            payload['embeds'] = embeds
+        while True:
+            await self._rate_limiter.acquire(self.url, f"channel {self.id}")
+            async with self._session.post(self.url, json=payload, headers=self.headers, timeout=self._timeout) as response:
+                self._rate_limiter.update(self.url, response.headers)
+                if response.status == 429:
+                    try:
+                        retry_after = float((await response.json()).get('retry_after'))
+                    except (ValueError, TypeError, aiohttp.ContentTypeError):
+                        retry_after = float(response.headers.get('Retry-After', 1))
+                    logging.warning(f"Rate limited posting to channel {self.id}, retrying in {retry_after:.2f}s")
+                    self._rate_limiter.rate_limited(self.url, response.headers, retry_after)
+                    continue
+                if response.status >= 400:
+                    raise DiscordAPIError(response.status, await response.text())
+                return await response.json()
+
+class GatewayChannel:
+    """A channel of the logged-in gateway client, sent embed dicts like a RESTChannel."""
+
+    def __init__(self, channel):
+        self.id = channel.id
+        self._channel = channel
+
+    async def send(self, content=None, embed=None, embeds=None):
+        """Post a message through discord.py and return the sent message."""
+        import discord
+        if embed is not None:
+            embeds = [embed]
+        kwargs = {}
+        if content is not None:
+            kwargs['content'] = content
+        if embeds:
+            kwargs['embeds'] = [discord.Embed.from_dict(embed) for embed in embeds]
+        try:
+            return await self._channel.send(**kwargs)
+        except discord.HTTPException as e:
+            raise DiscordAPIError(e.status, e.text) from e
+
+class SendScheduler:
+    """Sends Discord messages in order within a channel and in parallel across channels.
+
+    Each message is retried with backoff after a timeout, a connection error
+    or a server error instead of being dropped. Rate limits are waited out by
+    the channel itself (discord.py, or RESTChannel's rate limiter).
+    """
+
+    def __init__(self, timeout=30.0, attempts=3, stats=None):
+        self.timeout = timeout
+        self.attempts = attempts
+        self.stats = stats
+        self._channel_locks = defaultdict(asyncio.Lock)
+
+    async def send(self, channel, **kwargs):
+        """Send a message to channel, returning the message or None if every attempt failed."""
+        async with self._channel_locks[channel.id]:
+            for attempt in range(1, self.attempts + 1):
+                try:
+                    if isinstance(channel, RESTChannel):
+                        # Times out its requests itself, without counting rate-limit waits
+                        return await channel.send(**kwargs)
+                    return await asyncio.wait_for(channel.send(**kwargs), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    error = f"Timeout after {self.timeout}s"
+                except (aiohttp.ClientError, DiscordAPIError) as e:
+                    # Client errors other than rate limits will not succeed on a retry
+                    status = getattr(e, 'status', None)
+                    if status is not None and status < 500:
+                        logging.error(f"Error sending message to channel {channel.id}: {str(e)}")
+                        return None
+                    error = str(e)
+                if attempt < self.attempts:
+                    delay = 2 ** (attempt - 1)
+                    logging.warning(f"Error sending message to channel {channel.id} ({error}), "
+                                    f"retrying in {delay}s (attempt {attempt} of {self.attempts})")
+                    await asyncio.sleep(delay)
+                    if self.stats:
+                        self.stats.record('send_retry_wait', delay)
+            logging.error(f"Giving up sending message to channel {channel.id} after {self.attempts} attempts: {error}")
+            return None
+
+def load_config(path='config.yaml'):
+    """Read the bot's configuration file."""
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+def setup_logging(config):
+    """Log to the configured log file and to stderr without blocking the caller.
+
+    Records go on a queue and are written by a background listener thread,
+    which is stopped (and drained) at exit.
+    """
+    handlers = [logging.FileHandler(config['settings']['log_file']), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(config['settings'].get('log_level', 'INFO'))
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+
+def setup_worker_logging(log_file, level='INFO'):
+    """Log straight to the log file from a worker process, which has no queue listener."""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    logging.basicConfig(level=level, format=LOG_FORMAT,
+                        handlers=[logging.FileHandler(log_file), logging.StreamHandler()])
+
+class LazyRepr:
+    """Formats a debug payload only if the log record is actually emitted."""
+
+    def __init__(self, func):
+        self.func = func
+
+    def __str__(self):
+        return str(self.func())
+
+class Diagnostics:
+    """Rate-limited warnings and sampled debug dumps.
+
+    The same kind of warning for the same feed is logged warning_limit
+    times, then only counted until flush() reports how many were dropped.
+    Full payloads are only built and written, to their own dump file, when
+    one is configured, and then for a sample_rate share of the calls.
+    """
+
+    def __init__(self, warning_limit=3, dump_file=None, sample_rate=1.0):
+        self.warning_limit = warning_limit
+        self.sample_rate = sample_rate
+        self._counts = Counter()
+        self._dump_logger = None
+        if dump_file:
+            handler = logging.FileHandler(dump_file)
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            dump_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(dump_queue, handler)
+            listener.start()
+            atexit.register(listener.stop)
+            self._dump_logger = logging.getLogger('rss_discord_bot.dump')
+            self._dump_logger.propagate = False
+            self._dump_logger.setLevel(logging.DEBUG)
+            self._dump_logger.addHandler(logging.handlers.QueueHandler(dump_queue))
+
+    def warn(self, feed_name, kind, message, *args):
+        """Log a warning of kind for feed_name unless it was logged warning_limit times already."""
+        key = (feed_name, kind)
+        self._counts[key] += 1
+        if self._counts[key] <= self.warning_limit:
+            logging.warning(message, *args)
+
+    def dump(self, kind, payload):
+        """Write payload() to the dump file for a sample of the calls, if dumps are enabled."""
+        if self._dump_logger is None or random.random() >= self.sample_rate:
+            return
+        self._dump_logger.debug("%s:\n%s", kind, LazyRepr(payload))
+
+    def flush(self):
+        """Report the warnings dropped since the last flush."""
+        for (feed_name, kind), count in sorted(self._counts.items()):
+            if count > self.warning_limit:
+                logging.warning(f"Suppressed {count - self.warning_limit} more '{kind}' warnings for {feed_name}")
+        self._counts.clear()
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list of numbers."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+class RunStats:
+    """Per-stage timings and counters of a run, summarized as a JSON run report.
+
+    Spans are recorded per stage, and per feed and channel when given. Stages
+    overlap: concurrent fetches each count their own time, and database time
+    is also part of the stage that ran the query.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start a new run."""
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.timings = defaultdict(list)
+        self.feed_timings = defaultdict(Counter)
+        self.channel_timings = defaultdict(Counter)
+        self.counts = Counter()
+        self.skipped = Counter()
+
+    @contextmanager
+    def span(self, stage, feed=None, channel=None):
+        """Time the body of the with statement as a span of stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, feed, channel)
+
+    def record(self, stage, seconds, feed=None, channel=None):
+        """Record a span of stage that took seconds."""
+        self.timings[stage].append(seconds)
+        if feed is not None:
+            self.feed_timings[feed][stage] += seconds
+        if channel is not None:
+            self.channel_timings[channel][stage] += seconds
+
+    def report(self, slowest_feeds=10):
+        """Summarize the run as a JSON-serializable dict."""
+        def rounded(timings):
+            return {stage: round(seconds, 4) for stage, seconds in sorted(timings.items())}
+        
+        stages = {
+            stage: {
+                'count': len(values),
+                'total': round(sum(values), 4),
+                'p50': round(percentile(values, 0.5), 4),
+                'p95': round(percentile(values, 0.95), 4),
+                'max': round(max(values), 4),
+            }
+            for stage, values in sorted(self.timings.items())
+        }
+        slowest = sorted(self.feed_timings.items(), key=lambda item: sum(item[1].values()), reverse=True)
+        return {
+            'started_at': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            'duration': round(time.perf_counter() - self._start, 4),
+            'counts': dict(sorted(self.counts.items())),
+            'skipped': dict(sorted(self.skipped.items())),
+            'stages': stages,
+            'channels': {str(channel): rounded(timings) for channel, timings in self.channel_timings.items()},
+            'slowest_feeds': [
+                {'feed': feed, 'total': round(sum(timings.values()), 4), 'stages': rounded(timings)}
+                for feed, timings in slowest[:slowest_feeds]
+            ],
+        }
+
+    def write(self, path, report=None):
+        """Write the run report to path, replacing the previous run's report."""
+        report = report or self.report()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+        return report
+
+class RSSMonitor:
+    def __init__(self, from_start=False, target_category=None, outbox_only=False, daemon=False, config=None):
+        self.config = config if config is not None else load_config()
+        logging.debug("Loaded config: %s", self.config)
         self.target_category = target_category
         self.feeds = self.config['rss_feeds']
         self.start_date = datetime.now() - timedelta(days=7)
         self.from_start = from_start
         self.channels = self.config['settings']['channels']
-        logging.info(f"Channel config: {self.channels}")
+        logging.info(f"Configured channels: {', '.join(self.channels)}")
         self._session = None
         self._closed = False
+        # The discord.py client, created only when logging in to the gateway
+        self._client = None
         
-        # Initialize database first
-        self._init_db()
+        # How messages are posted: "gateway" logs in as a bot client, "rest" only
+        # uses the HTTP API (or channel webhooks) and skips the gateway login
+        self.posting_mode = self.config['settings'].get('posting_mode', 'gateway')
+        self.discord_api_base = self.config['settings'].get('discord_api_base', DISCORD_API_BASE)
+        self._rest_token = None
+        
+        # Per-stage timings and counters of the current run, written to the run report
+        self.stats = RunStats()
+        self.run_report_file = self.config['settings'].get('run_report_file', 'run_report.json')
+        self._rate_limiter = DiscordRateLimiter(stats=self.stats)
+        
+        # Sends messages with retries instead of fixed delays between them
+        self.sender = SendScheduler(
+            timeout=self.config['settings'].get('send_timeout', 30),
+            attempts=self.config['settings'].get('send_attempts', 3),
+            stats=self.stats,
+        )
+        self._conn = None
+        
+        # Rate-limited warnings, and full entry dumps to a separate file only when requested
+        self.diagnostics = Diagnostics(
+            warning_limit=self.config['settings'].get('warning_limit_per_feed', 3),
+            dump_file=self.config['settings'].get('debug_dump_file'),
+            sample_rate=self.config['settings'].get('debug_dump_sample_rate', 1.0),
+        )
+        
+        # Entries claimed by a channel this run, before their message reaches the outbox,
+        # and the fingerprints of the entries found new this run
+        self._claimed_entries = set()
+        self._run_fingerprints = FingerprintIndex()
+        self._run_started = time.time()
+        
+        # Skip articles already posted from another feed (same canonical link or near-identical text)
+        self.cross_feed_dedup = self.config['settings'].get('cross_feed_dedup', True)
+        # Bands only guarantee finding fingerprints that differ in fewer bits than there are bands
+        self.duplicate_max_distance = min(self.config['settings'].get('duplicate_max_distance', 3), SIMHASH_BANDS - 1)
+        # Failed messages are retried on later runs up to this many attempts
+        self.outbox_max_attempts = self.config['settings'].get('outbox_max_attempts', 5)
+        self.outbox_only = outbox_only
+        
+        # Daemon mode: poll each feed on its own interval, learned from how often it publishes
+        self.daemon = daemon
+        self.poll_min_interval = self.config['settings'].get('poll_min_interval', 15 * 60)
+        self.poll_max_interval = self.config['settings'].get('poll_max_interval', 24 * 60 * 60)
+        self.poll_jitter = self.config['settings'].get('poll_jitter', 0.1)
+        self.poll_batch_window = self.config['settings'].get('poll_batch_window', 60)
+        self._poll_hints = {}
+        self._poll_intervals = {}
+        self._poll_timestamps = {}
+        self._daemon_task = None
+        
+        # Concurrency limits for fetching feeds
+        self.max_concurrent_fetches = self.config['settings'].get('max_concurrent_fetches', 20)
+        self.max_fetches_per_host = self.config['settings'].get('max_fetches_per_host', 4)
+        self._fetch_semaphore = None
+        self._host_semaphores = {}
+        
+        # Retries of transient fetch errors, and the circuit breaker that skips failing feeds
+        self.fetch_retries = self.config['settings'].get('fetch_retries', 2)
+        self.feed_failure_threshold = self.config['settings'].get('feed_failure_threshold', 3)
+        self.feed_backoff_base = self.config['settings'].get('feed_backoff_base', 60 * 60)
+        self.feed_backoff_max = self.config['settings'].get('feed_backoff_max', 7 * 24 * 60 * 60)
+        self._feed_health = {}
+        
+        # Feeds per channel fetched ahead of the dedup stage, and whose new entries
+        # may be summarized ahead of posting
+        self.fetch_window = self.config['settings'].get('fetch_window', 8)
+        self.pipeline_queue_size = self.config['settings'].get('pipeline_queue_size', 4)
+        
+        # Worker pool for parsing, summarization and classification
+        self.executor_type = self.config['settings'].get('executor', 'thread')
+        self.executor_workers = self.config['settings'].get('executor_workers')
+        self._executor = None
+        
+        # HTML-to-text backend used for summaries: auto, stdlib, lxml or bs4
+        self.html_backend = self.config['settings'].get('html_backend', 'auto')
+        if self.html_backend != 'auto' and self.html_backend not in HTML_TEXT_BACKENDS:
+            logging.warning(f"Unknown html_backend '{self.html_backend}', using auto")
+            self.html_backend = 'auto'
+        
+        # Sentence splitting for summaries: the built-in splitter, or NLTK's punkt if opted in
+        self.sentence_splitter = self.config['settings'].get('sentence_splitter', 'builtin')
+        if self.sentence_splitter not in ('builtin', 'nltk'):
+            logging.warning(f"Unknown sentence_splitter '{self.sentence_splitter}', using builtin")
+            self.sentence_splitter = 'builtin'
+        
+        # Maximum number of cached summaries (0 disables the cache)
+        self.summary_cache_size = self.config['settings'].get('summary_cache_size', 5000)
         
-        # Then load seen entries
-        self.seen_entries = self.load_seen_entries()
+        # Per-feed state (HTTP validators, high-water mark): stored and updated this run
+        self._feed_states = {}
+        self._feed_state_updates = defaultdict(dict)
+        # Channels of this run still working on each feed, and the feeds one of them could not store
+        self._feed_holds = defaultdict(int)
+        self._unsaved_feeds = set()
+        
+        # Seen entries are looked up lazily; 'bloom' keeps an in-memory filter
+        # that answers "definitely new" without a database round-trip
+        self.seen_cache = self.config['settings'].get('seen_cache', 'none')
+        self._seen_filter = None
+        
+        # "full" keeps seen entry ids as text; "compact" keeps 64-bit hashes per feed id
+        self.seen_schema = self.config['settings'].get('seen_schema', 'full')
+        if self.seen_schema not in ('full', 'compact'):
+            logging.warning(f"Unknown seen_schema '{self.seen_schema}', using full")
+            self.seen_schema = 'full'
+        # Seen entries older than this many days are pruned (None keeps them forever);
+        # anything shorter than the recency window would let old entries be posted again
+        self.seen_retention_days = self.config['settings'].get('seen_retention_days')
+        if self.seen_retention_days is not None and self.seen_retention_days <= RECENT_ENTRY_DAYS:
+            logging.warning(f"seen_retention_days must be longer than {RECENT_ENTRY_DAYS} days, "
+                            f"using {RECENT_ENTRY_DAYS + 1}")
+            self.seen_retention_days = RECENT_ENTRY_DAYS + 1
+        
+        self._init_db()
         
         self.icons = {
             'google': '🔍',
@@ -295,22 +1976,65 @@ class RSSMonitor(discord.Client):
             }
         }
         self._last_category = None
-        self.stop_words = set(stopwords.words('english'))
 
-    async def setup_hook(self):
-        # This is called when the bot is starting up
+    async def run_with_gateway(self, token):
+        """Log in to the gateway as a bot client, which checks the feeds once it is ready."""
+        import discord
+        intents = discord.Intents.default()
+        intents.guild_messages = True
+        self._client = discord.Client(intents=intents)
+        self._client.event(self.on_ready)
         logging.info("Bot is starting up...")
-        self._session = aiohttp.ClientSession()
+        await self._init_session()
+        await self._client.start(token)
 
     async def close(self):
         if not self._closed:
             self._closed = True
+            if self._daemon_task and self._daemon_task is not asyncio.current_task():
+                self._daemon_task.cancel()
+                # Wait for it to stop before its session and database go away
+                await asyncio.gather(self._daemon_task, return_exceptions=True)
             if self._session:
                 await self._session.close()
-            await super().close()
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._close_db()
+            if self._client is not None:
+                await self._client.close()
+
+    async def run_without_gateway(self, token):
+        """Check all feeds and post over the HTTP API, without logging in to the gateway."""
+        logging.info("Posting over the Discord HTTP API, skipping the gateway login")
+        self._rest_token = token
+        try:
+            if self.daemon:
+                await self.run_daemon()
+            else:
+                await self.check_all_feeds()
+        finally:
+            await self.close()
+
+    def resolve_channel(self, channel_type, channel_id):
+        """Get the channel to post a channel type's entries to, or None if unavailable."""
+        if self.posting_mode != 'rest':
+            channel = self._client.get_channel(int(channel_id))
+            return GatewayChannel(channel) if channel else None
+        webhook_url = self.channels[channel_type].get('webhook_url')
+        if not webhook_url and not self._rest_token:
+            logging.error(f"No bot token or webhook_url to post to {channel_type} over the HTTP API")
+            return None
+        return RESTChannel(self._session, channel_id, self._rest_token, webhook_url, self.discord_api_base,
+                           self._rate_limiter, self.sender.timeout)
 
     async def on_ready(self):
-        logging.info(f'Bot is ready! Logged in as {self.user}')
+        logging.info(f'Bot is ready! Logged in as {self._client.user}')
+        if self.daemon:
+            # on_ready fires again after every reconnect
+            if self._daemon_task is None:
+                self._daemon_task = asyncio.create_task(self.run_daemon())
+                self._daemon_task.add_done_callback(self._log_daemon_exit)
+            return
         try:
             await self.check_all_feeds()
             await self.close()
@@ -318,6 +2042,14 @@ class RSSMonitor(discord.Client):
             logging.error(f"Error in on_ready: {str(e)}")
             await self.close()
 
+    def _log_daemon_exit(self, task):
+        """Log the error that stopped the gateway mode daemon task, if any."""
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        logging.error(f"Daemon mode stopped: {str(error)}")
+        logging.error("Stack trace:\n" + ''.join(traceback.format_exception(type(error), error, error.__traceback__)))
+
     def get_icon(self, feed_name, title):
         # First try to match feed name
         feed_name_lower = feed_name.lower()
@@ -361,116 +2093,41 @@ class RSSMonitor(discord.Client):
         return self.icons['default']
 
     def get_tldr(self, entry):
-        try:
-            # Try to get content from different possible fields
-            content = None
-            if hasattr(entry, 'content'):
-                content = entry.content[0].value
-            elif hasattr(entry, 'summary'):
-                content = entry.summary
-            elif hasattr(entry, 'description'):
-                content = entry.description
-
-            if not content:
-                return None
-
-            # Clean HTML and get text
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "meta", "link"]):
-                script.decompose()
-                
-            # Get the main content
-            text = soup.get_text()
-            
-            # Clean up the text
-            text = ' '.join(text.split())
-            
-            # Remove common unwanted phrases
-            unwanted_phrases = [
-                "undefined", "The post", "appeared first on", "Read more",
-                "Continue reading", "Click here", "Read the full article",
-                "View original", "Source:", "via", "Posted by", "Published by",
-                "Written by", "Share this", "Subscribe to", "Follow us",
-                "Join our", "Sign up"
-            ]
-            
-            for phrase in unwanted_phrases:
-                text = text.replace(phrase, "")
-                
-            # Clean up any double spaces and trim
-            text = ' '.join(text.split())
-            
-            # If text is too short, return it as is
-            if len(text.split()) < 50:
-                return text[:500] + "..." if len(text) > 500 else text
+        return summarize_content(_entry_content(entry), html_backend=self.html_backend, sentence_splitter=self.sentence_splitter)
 
-            try:
-                # Try using NLTK's sentence tokenizer
-                sentences = sent_tokenize(text)
-            except LookupError:
-                # Fallback to simple sentence splitting if NLTK tokenizer is not available
-                sentences = [s.strip() for s in text.split('.') if s.strip()]
-            
-            # Calculate word frequencies
-            word_frequencies = defaultdict(int)
-            for sentence in sentences:
-                # Simple word tokenization without NLTK
-                words = sentence.lower().split()
-                for word in words:
-                    if word not in self.stop_words and word not in string.punctuation:
-                        word_frequencies[word] += 1
-            
-            # Normalize word frequencies
-            max_frequency = max(word_frequencies.values()) if word_frequencies else 1
-            for word in word_frequencies:
-                word_frequencies[word] = word_frequencies[word] / max_frequency
-            
-            # Score sentences based on word frequencies
-            sentence_scores = defaultdict(float)
-            for sentence in sentences:
-                words = sentence.lower().split()
-                for word in words:
-                    if word in word_frequencies:
-                        sentence_scores[sentence] += word_frequencies[word]
-                # Normalize by sentence length
-                sentence_scores[sentence] /= len(words) if words else 1
-            
-            # Get top 3 sentences
-            top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)[:3]
-            summary = ' '.join(sentence for sentence, score in sorted(top_sentences, key=lambda x: sentences.index(x[0])))
-            
-            # Limit to 30 words
-            words = summary.split()
-            if len(words) > 30:
-                return ' '.join(words[:30]) + '...'
-            return summary
-                
-        except Exception as e:
-            logging.error(f"Error in get_tldr: {str(e)}")
-            # Fallback to simple extraction
-            try:
-                words = text.split()
-                return ' '.join(words[:30]) + '...'
-            except:
-                return None
+    def _get_connection(self):
+        """Get the long-lived database connection, opening it on first use."""
+        if self._conn is None:
+            db_path = self.config['settings'].get('db_path', 'rss_bot.db')
+            self._conn = sqlite3.connect(db_path)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.create_function('entry_hash', 1, _entry_hash, deterministic=True)
+            # WAL lets the appends commit without rewriting the main database file
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        return self._conn
+
+    def _close_db(self):
+        """Close the long-lived database connection if it is open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
     @contextmanager
     def _get_db(self):
-        """Context manager for database connections."""
-        db_path = self.config['settings'].get('db_path', 'rss_bot.db')
-        conn = None
+        """Context manager yielding the shared database connection and a fresh cursor."""
+        cur = None
         try:
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            yield conn, conn.cursor()
+            conn = self._get_connection()
+            cur = conn.cursor()
+            with self.stats.span('sqlite'):
+                yield conn, cur
         except Exception as e:
             logging.error(f"Database connection error: {str(e)}")
             raise
         finally:
-            if conn:
-                conn.close()
+            if cur:
+                cur.close()
 
     def _init_db(self):
         """Initialize the SQLite database."""
@@ -485,23 +2142,116 @@ class RSSMonitor(discord.Client):
         conn = None
         try:
             conn = sqlite3.connect(db_path)
+            conn.create_function('entry_hash', 1, _entry_hash, deterministic=True)
             cur = conn.cursor()
             
-            # Create the table if it doesn't exist
+            if self.seen_schema == 'compact':
+                self._init_compact_seen_tables(conn, cur)
+            else:
+                # The compact migration drops seen_entries, so an empty new one would repost recent entries
+                cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name IN ('seen_entries', 'seen_hashes')")
+                if {row[0] for row in cur.fetchall()} == {'seen_hashes'}:
+                    cur.execute('SELECT EXISTS (SELECT 1 FROM seen_hashes)')
+                    if cur.fetchone()[0]:
+                        raise Exception("The seen entries were migrated to seen_schema: compact, which cannot be "
+                                        "undone; set seen_schema: compact again")
+                # Create the table if it doesn't exist
+                cur.execute('''
+                    CREATE TABLE IF NOT EXISTS seen_entries (
+                        feed_name TEXT,
+                        entry_id TEXT,
+                        seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (feed_name, entry_id)
+                    )
+                ''')
+                cur.execute('CREATE INDEX IF NOT EXISTS idx_seen_entries_seen_at ON seen_entries (seen_at)')
+            
+            # Per-feed state kept between runs
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS feed_state (
+                    feed_name TEXT PRIMARY KEY,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Add any state columns missing from databases created by older versions
+            cur.execute('PRAGMA table_info(feed_state)')
+            existing_columns = {row[1] for row in cur.fetchall()}
+            for column, column_type in FEED_STATE_COLUMNS.items():
+                if column not in existing_columns:
+                    cur.execute(f'ALTER TABLE feed_state ADD COLUMN {column} {column_type}')
+            
+            # Fetch health per feed, for the circuit breaker
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS feed_health (
+                    feed_name TEXT PRIMARY KEY,
+                    last_success REAL,
+                    last_attempt REAL,
+                    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                    avg_latency REAL,
+                    last_status TEXT,
+                    open_until REAL
+                )
+            ''')
+            
+            # Cached TL;DRs, evicted least recently used first
             cur.execute('''
-                CREATE TABLE IF NOT EXISTS seen_entries (
+                CREATE TABLE IF NOT EXISTS summary_cache (
+                    content_hash TEXT PRIMARY KEY,
+                    tldr TEXT,
+                    last_used REAL
+                )
+            ''')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used ON summary_cache (last_used)')
+            
+            # Formatted messages waiting to be posted; their entries count as
+            # seen only once the message is sent
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel_type TEXT NOT NULL,
+                    embeds TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_outbox_state ON outbox (state, channel_type)')
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS outbox_entries (
+                    message_id INTEGER NOT NULL,
+                    feed_name TEXT,
+                    entry_id TEXT,
+                    PRIMARY KEY (feed_name, entry_id)
+                )
+            ''')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_outbox_entries_message ON outbox_entries (message_id)')
+            
+            # Canonical links and SimHash bands of recently posted entries, for cross-feed dedup
+            band_columns = ''.join(f'band{band} INTEGER, ' for band in range(SIMHASH_BANDS))
+            cur.execute(f'''
+                CREATE TABLE IF NOT EXISTS entry_fingerprints (
                     feed_name TEXT,
                     entry_id TEXT,
-                    seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    canonical_link TEXT,
+                    simhash INTEGER,
+                    {band_columns}
+                    seen_at REAL,
                     PRIMARY KEY (feed_name, entry_id)
                 )
             ''')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_entry_fingerprints_link ON entry_fingerprints (canonical_link)')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_entry_fingerprints_seen_at ON entry_fingerprints (seen_at)')
+            self._migrate_fingerprint_bands(conn, cur)
+            for band in range(SIMHASH_BANDS):
+                cur.execute(f'CREATE INDEX IF NOT EXISTS idx_entry_fingerprints_band{band} ON entry_fingerprints (band{band})')
             conn.commit()
             
             # Verify table exists
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='seen_entries'")
+            seen_table = 'seen_hashes' if self.seen_schema == 'compact' else 'seen_entries'
+            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (seen_table,))
             if not cur.fetchone():
-                raise Exception("Failed to create seen_entries table")
+                raise Exception(f"Failed to create {seen_table} table")
                 
             logging.info("Database initialized successfully")
             
@@ -512,609 +2262,652 @@ class RSSMonitor(discord.Client):
             if conn:
                 conn.close()
 
-    def load_seen_entries(self):
-        """Load seen entries from SQLite database."""
-        seen_entries = defaultdict(list)
+    def _init_compact_seen_tables(self, conn, cur):
+        """Create the compact seen-entry tables, migrating the rows of seen_entries once."""
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS feeds (
+                feed_id INTEGER PRIMARY KEY,
+                feed_name TEXT UNIQUE NOT NULL
+            )
+        ''')
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS seen_hashes (
+                feed_id INTEGER NOT NULL,
+                entry_hash INTEGER NOT NULL,
+                seen_at INTEGER NOT NULL,
+                PRIMARY KEY (feed_id, entry_hash)
+            ) WITHOUT ROWID
+        ''')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_seen_hashes_seen_at ON seen_hashes (seen_at)')
+        conn.commit()
+        
+        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='seen_entries'")
+        if not cur.fetchone():
+            return
+        logging.info("Migrating seen_entries to the compact schema")
+        with conn:
+            cur.execute('INSERT OR IGNORE INTO feeds (feed_name) SELECT DISTINCT feed_name FROM seen_entries')
+            cur.execute('''
+                INSERT OR IGNORE INTO seen_hashes (feed_id, entry_hash, seen_at)
+                SELECT feeds.feed_id, entry_hash(seen_entries.entry_id),
+                       COALESCE(CAST(strftime('%s', seen_entries.seen_at) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER))
+                FROM seen_entries JOIN feeds ON feeds.feed_name = seen_entries.feed_name
+                WHERE seen_entries.entry_id IS NOT NULL
+            ''')
+            migrated = cur.rowcount
+            cur.execute('DROP TABLE seen_entries')
+        # Give the space of the old table back to the file system
+        cur.execute('VACUUM')
+        logging.info(f"Migrated {migrated} seen entries to the compact schema")
+
+    def _migrate_fingerprint_bands(self, conn, cur):
+        """Rebuild entry_fingerprints if it was created with another number of SimHash bands."""
+        cur.execute('PRAGMA table_info(entry_fingerprints)')
+        bands = sum(1 for row in cur.fetchall() if re.fullmatch(r'band\d+', row[1]))
+        if bands == SIMHASH_BANDS:
+            return
+        logging.info(f"Rebuilding the dedup fingerprints with {SIMHASH_BANDS} SimHash bands instead of {bands}")
+        band_columns = ''.join(f'band{band} INTEGER, ' for band in range(SIMHASH_BANDS))
+        with conn:
+            cur.execute('SELECT feed_name, entry_id, canonical_link, simhash, seen_at FROM entry_fingerprints')
+            rows = cur.fetchall()
+            cur.execute('DROP TABLE entry_fingerprints')
+            cur.execute(f'''
+                CREATE TABLE entry_fingerprints (
+                    feed_name TEXT,
+                    entry_id TEXT,
+                    canonical_link TEXT,
+                    simhash INTEGER,
+                    {band_columns}
+                    seen_at REAL,
+                    PRIMARY KEY (feed_name, entry_id)
+                )
+            ''')
+            cur.execute('CREATE INDEX idx_entry_fingerprints_link ON entry_fingerprints (canonical_link)')
+            cur.execute('CREATE INDEX idx_entry_fingerprints_seen_at ON entry_fingerprints (seen_at)')
+            cur.executemany(
+                f"INSERT INTO entry_fingerprints VALUES ({', '.join('?' * (SIMHASH_BANDS + 5))})",
+                [
+                    (feed_name, entry_id, link, fingerprint,
+                     *(simhash_bands(fingerprint) if fingerprint is not None else [None] * SIMHASH_BANDS), seen_at)
+                    for feed_name, entry_id, link, fingerprint, seen_at in rows
+                ]
+            )
+
+    def _filter_key(self, feed_name, entry_id):
+        """Build the Bloom filter key of a seen entry for the configured seen schema."""
+        if self.seen_schema == 'compact':
+            return _seen_key(feed_name, _entry_hash(entry_id))
+        return _seen_key(feed_name, entry_id)
+
+    def _get_seen_filter(self):
+        """Build the Bloom filter of seen entries on first use, sized from the table."""
+        if self.seen_cache != 'bloom':
+            return None
+        if self._seen_filter is None:
+            try:
+                with self._get_db() as (conn, cur):
+                    if self.seen_schema == 'compact':
+                        cur.execute('SELECT COUNT(*) FROM seen_hashes')
+                        count = cur.fetchone()[0]
+                        # Leave headroom for the entries added over the next runs
+                        seen_filter = BloomFilter(max(count * 2, 10000))
+                        for feed_name, entry_hash in cur.execute(
+                                'SELECT feeds.feed_name, seen_hashes.entry_hash FROM seen_hashes JOIN feeds USING (feed_id)'):
+                            seen_filter.add(_seen_key(feed_name, entry_hash))
+                    else:
+                        cur.execute('SELECT COUNT(*) FROM seen_entries')
+                        count = cur.fetchone()[0]
+                        # Leave headroom for the entries added over the next runs
+                        seen_filter = BloomFilter(max(count * 2, 10000))
+                        for feed_name, entry_id in cur.execute('SELECT feed_name, entry_id FROM seen_entries'):
+                            seen_filter.add(_seen_key(feed_name, entry_id))
+                    # Entries waiting in the outbox are not new either
+                    for feed_name, entry_id in cur.execute('SELECT feed_name, entry_id FROM outbox_entries'):
+                        seen_filter.add(self._filter_key(feed_name, entry_id))
+                self._seen_filter = seen_filter
+                logging.info(f"Built seen entries filter from {count} entries")
+            except Exception as e:
+                logging.error(f"Error building seen entries filter: {str(e)}")
+                self.seen_cache = 'none'
+        return self._seen_filter
+
+    def enqueue_message(self, channel_type, embeds, keys):
+        """Store a formatted message in the outbox with its (feed_name, entry_id) keys.
+
+        Returns the message id, or None if it could not be stored.
+        """
+        keys = [key for key in keys if key[1]]
         try:
             with self._get_db() as (conn, cur):
-                cur.execute('SELECT feed_name, entry_id FROM seen_entries')
-                rows = cur.fetchall()
-                logging.info(f"Loaded {len(rows)} seen entries from database")
-                for feed_name, entry_id in rows:
-                    seen_entries[feed_name].append(entry_id)
-            return seen_entries
+                with conn:
+                    cur.execute(
+                        'INSERT INTO outbox (channel_type, embeds) VALUES (?, ?)',
+                        (channel_type, json.dumps(embeds))
+                    )
+                    message_id = cur.lastrowid
+                    cur.executemany(
+                        'INSERT OR IGNORE INTO outbox_entries (message_id, feed_name, entry_id) VALUES (?, ?, ?)',
+                        [(message_id, feed_name, entry_id) for feed_name, entry_id in keys]
+                    )
+            if self._seen_filter is not None:
+                for key in keys:
+                    self._seen_filter.add(self._filter_key(*key))
+            return message_id
         except Exception as e:
-            logging.error(f"Error loading seen entries: {str(e)}")
-            return defaultdict(list)
+            logging.error(f"Error adding message to the outbox: {str(e)}")
+            return None
 
-    def save_seen_entries(self):
-        """Save seen entries to SQLite database."""
+    def load_outbox(self, channel_type):
+        """Load the pending and retryable failed messages of a channel type, oldest first.
+
+        Returns a list of (message_id, embeds).
+        """
         try:
             with self._get_db() as (conn, cur):
-                # Get all current entries
-                cur.execute('SELECT feed_name, entry_id FROM seen_entries')
-                existing_entries = {(feed_name, entry_id) for feed_name, entry_id in cur.fetchall()}
-                
-                # Prepare new entries to insert
-                new_entries = []
-                for feed_name, entries in self.seen_entries.items():
-                    for entry_id in entries:
-                        if (feed_name, entry_id) not in existing_entries:
-                            new_entries.append((feed_name, entry_id))
-                
-                # Insert new entries
-                if new_entries:
-                    cur.executemany(
-                        'INSERT OR IGNORE INTO seen_entries (feed_name, entry_id) VALUES (?, ?)',
-                        new_entries
+                cur.execute('''
+                    SELECT id, embeds FROM outbox
+                    WHERE channel_type = ? AND (state = 'pending' OR (state = 'failed' AND attempts < ?))
+                    ORDER BY id
+                ''', (channel_type, self.outbox_max_attempts))
+                return [
+                    (row['id'], json.loads(row['embeds']))
+                    for row in cur.fetchall()
+                ]
+        except Exception as e:
+            logging.error(f"Error loading the outbox for {channel_type}: {str(e)}")
+            return []
+
+    def mark_message_sent(self, message_id):
+        """Mark an outbox message as sent and its entries as seen, in one transaction."""
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    if self.seen_schema == 'compact':
+                        cur.execute('''
+                            INSERT OR IGNORE INTO feeds (feed_name)
+                            SELECT DISTINCT feed_name FROM outbox_entries WHERE message_id = ?
+                        ''', (message_id,))
+                        cur.execute('''
+                            INSERT OR IGNORE INTO seen_hashes (feed_id, entry_hash, seen_at)
+                            SELECT feeds.feed_id, entry_hash(outbox_entries.entry_id), CAST(strftime('%s', 'now') AS INTEGER)
+                            FROM outbox_entries JOIN feeds ON feeds.feed_name = outbox_entries.feed_name
+                            WHERE outbox_entries.message_id = ?
+                        ''', (message_id,))
+                    else:
+                        cur.execute('''
+                            INSERT OR IGNORE INTO seen_entries (feed_name, entry_id)
+                            SELECT feed_name, entry_id FROM outbox_entries WHERE message_id = ?
+                        ''', (message_id,))
+                    saved = cur.rowcount
+                    cur.execute('DELETE FROM outbox_entries WHERE message_id = ?', (message_id,))
+                    cur.execute(
+                        "UPDATE outbox SET state = 'sent', updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                        (message_id,)
                     )
-                    conn.commit()
-                    logging.info(f"Saved {len(new_entries)} new entries to database")
-                    
-                    # Verify the entries were saved
-                    cur.execute('SELECT COUNT(*) FROM seen_entries')
-                    total_entries = cur.fetchone()[0]
-                    logging.info(f"Total entries in database: {total_entries}")
+            logging.info(f"Saved {saved} new entries to database")
         except Exception as e:
-            logging.error(f"Error saving seen entries: {str(e)}")
+            logging.error(f"Error marking message {message_id} as sent: {str(e)}")
 
-    def is_entry_new(self, feed_name, entry):
-        """Check if an entry is new by querying the database."""
-        entry_id = entry.get('id', entry.get('link', ''))
-        
-        if not entry_id:
-            logging.warning(f"No entry ID found for entry from {feed_name}")
-            return True
-            
-        if self.from_start:
-            return True
-            
+    def mark_message_failed(self, message_id):
+        """Record a failed delivery attempt of an outbox message."""
         try:
             with self._get_db() as (conn, cur):
-                # Check if entry exists in database
-                cur.execute('SELECT 1 FROM seen_entries WHERE feed_name = ? AND entry_id = ?', (feed_name, entry_id))
-                return cur.fetchone() is None
+                with conn:
+                    cur.execute('''
+                        UPDATE outbox SET state = 'failed', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (message_id,))
         except Exception as e:
-            logging.error(f"Error checking if entry is new: {str(e)}")
-            return True  # If there's an error, treat it as new
+            logging.error(f"Error marking message {message_id} as failed: {str(e)}")
 
-    def is_entry_recent(self, entry):
+    def prune_seen_entries(self):
+        """Delete seen entries older than the seen_retention_days window."""
+        if self.seen_retention_days is None:
+            return
+        cutoff = time.time() - self.seen_retention_days * 24 * 60 * 60
         try:
-            # Get feed name for better error reporting
-            feed_name = getattr(entry, 'feed', {}).get('title', 'Unknown')
-            entry_title = entry.get('title', 'Unknown')
-
-            # List of possible date fields to check
-            date_fields = [
-                'published_parsed',
-                'updated_parsed',
-                'created_parsed',
-                'modified_parsed',
-                'date_parsed',
-                'pubDate_parsed',
-                'dc:date_parsed',
-                'dc:created_parsed',
-                'dc:modified_parsed'
-            ]
-            
-            # Try parsed date fields first
-            for field in date_fields:
-                if hasattr(entry, field):
-                    try:
-                        date_tuple = getattr(entry, field)
-                        if date_tuple:
-                            published = datetime(*date_tuple[:6])
-                            # Check if the date is within 7 days before current date
-                            now = datetime.now()
-                            time_diff = (now - published).total_seconds()
-                            return time_diff <= (7 * 24 * 60 * 60)  # 7 days in seconds
-                    except (TypeError, ValueError) as e:
-                        logging.debug(f"Could not parse {field} for entry '{entry_title}' from feed '{feed_name}': {str(e)}")
+            with self._get_db() as (conn, cur):
+                with conn:
+                    if self.seen_schema == 'compact':
+                        cur.execute('DELETE FROM seen_hashes WHERE seen_at < ?', (int(cutoff),))
+                    else:
+                        cur.execute("DELETE FROM seen_entries WHERE seen_at < datetime(?, 'unixepoch')", (cutoff,))
+                    if cur.rowcount:
+                        logging.info(f"Pruned {cur.rowcount} seen entries older than {self.seen_retention_days} days")
+        except Exception as e:
+            logging.error(f"Error pruning seen entries: {str(e)}")
+
+    def find_duplicates(self, feed_name, entries):
+        """Find the new entries of a feed that duplicate an entry of another feed (or with another id).
+
+        Entries match on the canonical link, or on a title+summary SimHash
+        within duplicate_max_distance bits of an entry from another feed.
+        Entries of one feed often share boilerplate summaries, so SimHash
+        matches within a feed are not duplicates. The earlier entries are
+        looked up through the band indexes in chunked queries, and in the
+        entries found new earlier this run, which the entries that are not
+        duplicates are added to. Returns a dict mapping the index of each
+        duplicate in entries to the (feed_name, entry_id) it duplicates.
+        """
+        earlier = FingerprintIndex()
+        for other_feed, other_id, other_link, other_fingerprint in self.find_fingerprint_candidates(feed_name, entries):
+            earlier.add((other_feed, other_id), other_link, other_fingerprint)
+
+        duplicates = {}
+        for index, entry in enumerate(entries):
+            key = (feed_name, entry['id'] or entry['link'])
+            link, fingerprint = entry.get('canonical_link'), entry.get('simhash')
+            duplicate = (earlier.match(key, link, fingerprint, self.duplicate_max_distance)
+                         or self._run_fingerprints.match(key, link, fingerprint, self.duplicate_max_distance))
+            if duplicate:
+                duplicates[index] = duplicate
+            else:
+                # Later entries, feeds and channels of this run see it right away
+                self._run_fingerprints.add(key, link, fingerprint)
+        return duplicates
+
+    def find_fingerprint_candidates(self, feed_name, entries):
+        """Load the stored fingerprints sharing a canonical link or a SimHash band with entries.
+
+        Only fingerprints of other feeds are loaded for the bands. Returns a
+        list of (feed_name, entry_id, canonical_link, simhash) rows.
+        """
+        # With --from-start only this run's entries count, or everything would be a duplicate
+        since = self._run_started if self.from_start else time.time() - DUPLICATE_WINDOW_DAYS * 24 * 60 * 60
+        chunk_size = SQLITE_CHUNK_SIZE // (SIMHASH_BANDS + 1)
+        candidates = []
+        try:
+            with self._get_db() as (conn, cur):
+                for i in range(0, len(entries), chunk_size):
+                    chunk = entries[i:i + chunk_size]
+                    links = {entry['canonical_link'] for entry in chunk if entry.get('canonical_link')}
+                    bands = [
+                        {simhash_bands(entry['simhash'])[band] for entry in chunk if entry.get('simhash') is not None}
+                        for band in range(SIMHASH_BANDS)
+                    ]
+                    conditions, params = [], []
+                    if links:
+                        conditions.append(f"canonical_link IN ({','.join('?' * len(links))})")
+                        params.extend(links)
+                    for band, values in enumerate(bands):
+                        if values:
+                            # The feed check is repeated in each term so every term keeps its band index
+                            conditions.append(f"(band{band} IN ({','.join('?' * len(values))}) AND feed_name != ?)")
+                            params.extend([*values, feed_name])
+                    if not conditions:
                         continue
+                    cur.execute(f'''
+                        SELECT feed_name, entry_id, canonical_link, simhash FROM entry_fingerprints
+                        WHERE ({' OR '.join(conditions)}) AND seen_at >= ?
+                    ''', (*params, since))
+                    candidates.extend(tuple(row) for row in cur.fetchall())
+        except Exception as e:
+            logging.error(f"Error looking up duplicates: {str(e)}")
+        return candidates
 
-            # If no parsed date found, try string date fields
-            date_string_fields = [
-                'published',
-                'updated',
-                'created',
-                'modified',
-                'date',
-                'pubDate',
-                'dc:date',
-                'dc:created',
-                'dc:modified'
-            ]
-            
-            # Common date formats to try
-            date_formats = [
-                '%Y-%m-%dT%H:%M:%S%z',  # ISO 8601 with timezone
-                '%Y-%m-%dT%H:%M:%S',    # ISO 8601 without timezone
-                '%a, %d %b %Y %H:%M:%S %z',  # RFC 822 with timezone
-                '%a, %d %b %Y %H:%M:%S',     # RFC 822 without timezone
-                '%Y-%m-%d %H:%M:%S%z',       # Custom with timezone
-                '%Y-%m-%d %H:%M:%S',         # Custom without timezone
-                '%d %b %Y %H:%M:%S %z',      # Alternative format with timezone
-                '%d %b %Y %H:%M:%S',         # Alternative format without timezone
-                '%Y-%m-%d'                   # Just date
-            ]
+    def record_fingerprints(self, entries):
+        """Add the canonical links and SimHashes of new entries to the dedup index, in one transaction."""
+        rows = [
+            (entry['feed_name'], entry['id'] or entry['link'], entry.get('canonical_link'), entry.get('simhash'),
+             *(simhash_bands(entry['simhash']) if entry.get('simhash') is not None else [None] * SIMHASH_BANDS))
+            for entry in entries
+            if entry['id'] or entry['link']
+        ]
+        if not rows:
+            return
+        band_columns = ', '.join(f'band{band}' for band in range(SIMHASH_BANDS))
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    now = time.time()
+                    cur.executemany(f'''
+                        INSERT OR REPLACE INTO entry_fingerprints
+                            (feed_name, entry_id, canonical_link, simhash, {band_columns}, seen_at)
+                        VALUES ({', '.join('?' * (SIMHASH_BANDS + 5))})
+                    ''', [(*row, now) for row in rows])
+        except Exception as e:
+            logging.error(f"Error saving entry fingerprints: {str(e)}")
 
-            for field in date_string_fields:
-                date_str = getattr(entry, field, None)
-                if date_str:
-                    for date_format in date_formats:
-                        try:
-                            published = datetime.strptime(date_str, date_format)
-                            # If timezone info is missing, assume UTC
-                            if published.tzinfo is None:
-                                published = published.replace(tzinfo=timezone.utc)
-                            # Check if the date is within 7 days before current date
-                            now = datetime.now(published.tzinfo)
-                            time_diff = (now - published).total_seconds()
-                            return time_diff <= (7 * 24 * 60 * 60)  # 7 days in seconds
-                        except ValueError:
-                            continue
+    def prune_fingerprints(self):
+        """Delete dedup fingerprints older than DUPLICATE_WINDOW_DAYS."""
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    cur.execute('DELETE FROM entry_fingerprints WHERE seen_at < ?',
+                                (time.time() - DUPLICATE_WINDOW_DAYS * 24 * 60 * 60,))
+        except Exception as e:
+            logging.error(f"Error pruning entry fingerprints: {str(e)}")
 
-            # If still no date found, try to extract date from entry ID or link
-            if hasattr(entry, 'id'):
-                # Some feeds include date in their IDs
-                id_date_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2})', entry.id)
-                if id_date_match:
-                    try:
-                        date_str = id_date_match.group(1)
-                        published = datetime.strptime(date_str, '%Y-%m-%d')
-                        # Check if the date is within 7 days before current date
-                        now = datetime.now()
-                        time_diff = (now - published).total_seconds()
-                        return time_diff <= (7 * 24 * 60 * 60)  # 7 days in seconds
-                    except ValueError:
-                        pass
-
-            # If no date found at all, dump the full entry data as JSON
-            entry_data = {}
-            for key in dir(entry):
-                if not key.startswith('_'):  # Skip internal attributes
-                    try:
-                        value = getattr(entry, key)
-                        # Convert to string if it's not JSON serializable
-                        if not isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                            value = str(value)
-                        entry_data[key] = value
-                    except Exception as e:
-                        entry_data[key] = f"<Error getting value: {str(e)}>"
-            
-            logging.warning(f"No date found for entry '{entry_title}' from feed '{feed_name}'")
-            logging.warning("Full entry data:")
-            logging.warning(json.dumps(entry_data, indent=2))
-            return False
+    def prune_outbox(self):
+        """Give up on messages that failed outbox_max_attempts times, and delete old finished messages.
+
+        The entries of a message given up on no longer count as seen. Sent and
+        given-up messages are deleted after OUTBOX_SENT_RETENTION_DAYS.
+        """
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    cur.execute('''
+                        DELETE FROM outbox_entries WHERE message_id IN (
+                            SELECT id FROM outbox WHERE state = 'failed' AND attempts >= ?
+                        )
+                    ''', (self.outbox_max_attempts,))
+                    if cur.rowcount:
+                        logging.warning(f"Gave up on {cur.rowcount} outbox entries after {self.outbox_max_attempts} failed attempts")
+                    cur.execute('''
+                        DELETE FROM outbox
+                        WHERE (state = 'sent' OR (state = 'failed' AND attempts >= ?))
+                        AND updated_at < datetime('now', ?)
+                    ''', (self.outbox_max_attempts, f'-{OUTBOX_SENT_RETENTION_DAYS} days'))
+                    if cur.rowcount:
+                        logging.info(f"Pruned {cur.rowcount} finished messages from the outbox")
+        except Exception as e:
+            logging.error(f"Error pruning the outbox: {str(e)}")
+
+    def load_feed_states(self, feed_names):
+        """Load the stored state of feed_names.
+
+        Returns a dict mapping feed name to a dict of its feed_state columns.
+        """
+        feed_names = list(feed_names)
+        states = {}
+        try:
+            with self._get_db() as (conn, cur):
+                for i in range(0, len(feed_names), SQLITE_CHUNK_SIZE):
+                    chunk = feed_names[i:i + SQLITE_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cur.execute(
+                        f'SELECT feed_name, {", ".join(FEED_STATE_COLUMNS)} FROM feed_state WHERE feed_name IN ({placeholders})',
+                        chunk
+                    )
+                    for row in cur.fetchall():
+                        states[row['feed_name']] = {column: row[column] for column in FEED_STATE_COLUMNS}
+        except Exception as e:
+            logging.error(f"Error loading feed states: {str(e)}")
+        return states
+
+    def load_feed_health(self, feed_names):
+        """Load the fetch health of feed_names as a dict of feed name to feed_health row."""
+        feed_names = list(feed_names)
+        health = {}
+        try:
+            with self._get_db() as (conn, cur):
+                for i in range(0, len(feed_names), SQLITE_CHUNK_SIZE):
+                    chunk = feed_names[i:i + SQLITE_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cur.execute(f'SELECT * FROM feed_health WHERE feed_name IN ({placeholders})', chunk)
+                    for row in cur.fetchall():
+                        health[row['feed_name']] = dict(row)
+        except Exception as e:
+            logging.error(f"Error loading feed health: {str(e)}")
+        return health
+
+    def feed_circuit_open(self, feed_name):
+        """Check whether a feed is being skipped after repeated failures."""
+        open_until = self._feed_health.get(feed_name, {}).get('open_until')
+        return open_until is not None and open_until > time.time()
+
+    def record_fetch_result(self, feed_name, success, status, latency=None):
+        """Update and persist a feed's health after a fetch.
+
+        A success closes the circuit. After feed_failure_threshold consecutive
+        failures the circuit opens: the feed is skipped until a probe is due,
+        with the wait doubling on every further failure.
+        """
+        now = time.time()
+        health = self._feed_health.setdefault(feed_name, {'consecutive_failures': 0})
+        health.update(last_attempt=now, last_status=status)
+        if success:
+            health.update(last_success=now, consecutive_failures=0, open_until=None)
+            if latency is not None:
+                # Exponentially weighted, so recent responses count the most
+                previous = health.get('avg_latency')
+                health['avg_latency'] = latency if previous is None else 0.7 * previous + 0.3 * latency
+        else:
+            failures = health['consecutive_failures'] = (health.get('consecutive_failures') or 0) + 1
+            if failures >= self.feed_failure_threshold:
+                backoff = min(self.feed_backoff_base * 2 ** (failures - self.feed_failure_threshold), self.feed_backoff_max)
+                health['open_until'] = now + backoff
+                logging.warning(f"Feed {feed_name} failed {failures} times in a row ({status}), "
+                                f"skipping it for {backoff / 3600:.1f}h")
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    cur.execute('''
+                        INSERT OR REPLACE INTO feed_health
+                            (feed_name, last_success, last_attempt, consecutive_failures, avg_latency, last_status, open_until)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (feed_name, health.get('last_success'), now, health['consecutive_failures'],
+                          health.get('avg_latency'), status, health.get('open_until')))
+        except Exception as e:
+            logging.error(f"Error saving health of {feed_name}: {str(e)}")
+
+    def update_feed_state(self, feed_name, **values):
+        """Buffer feed_state column updates; they are written by save_feed_state()."""
+        self._feed_state_updates[feed_name].update(values)
+
+    def save_feed_state(self, feed_name):
+        """Persist the state updates buffered for feed_name during this run."""
+        values = self._feed_state_updates.pop(feed_name, None)
+        if not values:
+            return
+        columns = [column for column in FEED_STATE_COLUMNS if column in values]
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    cur.execute(f'''
+                        INSERT INTO feed_state (feed_name, {", ".join(columns)}, updated_at)
+                        VALUES (?, {", ".join("?" * len(columns))}, CURRENT_TIMESTAMP)
+                        ON CONFLICT(feed_name) DO UPDATE SET
+                            {", ".join(f"{column} = excluded.{column}" for column in columns)},
+                            updated_at = excluded.updated_at
+                    ''', (feed_name, *(values[column] for column in columns)))
+        except Exception as e:
+            logging.error(f"Error saving state for {feed_name}: {str(e)}")
+
+    def release_feed_state(self, feed_name, save=True):
+        """Mark a channel as done with feed_name, and save its state once every channel is.
 
+        A feed listed under several channels keeps its state unsaved until all
+        of them have stored its new entries in the outbox. If one of them could
+        not (save=False), the state is not saved this run, so the entries are
+        found again on the next one.
+        """
+        if not save:
+            self._unsaved_feeds.add(feed_name)
+        self._feed_holds[feed_name] -= 1
+        if self._feed_holds[feed_name] > 0:
+            return
+        if feed_name in self._unsaved_feeds:
+            logging.warning(f"Not saving the state of {feed_name}, its entries were not stored in the outbox")
+            return
+        self.save_feed_state(feed_name)
+
+    def entries_above_high_water_mark(self, feed_name, entries):
+        """Return the entries of feed_name that are newer than its high-water mark.
+
+        Feeds are normally reverse-chronological, so the walk stops at the first
+        entry older than the stored mark (or at the mark entry itself). If the
+        feed is out of order or has undated entries, all entries are returned
+        and left to the regular dedup. The mark is advanced to the newest entry.
+        """
+        timestamps = [entry['timestamp'] for entry in entries]
+        state = self._feed_states.get(feed_name, {})
+        mark = state.get('hwm_published')
+
+        # Remember the newest entry of this fetch for the next run
+        dated = [(timestamp, index) for index, timestamp in enumerate(timestamps) if timestamp is not None]
+        if dated:
+            newest, index = max(dated)
+            if mark is None or newest >= mark:
+                self.update_feed_state(feed_name, hwm_published=newest, hwm_entry_id=entries[index]['id'])
+
+        in_order = (
+            len(dated) == len(entries)
+            and all(newer >= older for newer, older in zip(timestamps, timestamps[1:]))
+        )
+        if self.from_start or mark is None or not in_order:
+            return entries
+
+        mark_id = state.get('hwm_entry_id')
+        for index, (entry, timestamp) in enumerate(zip(entries, timestamps)):
+            if timestamp < mark or (mark_id and entry['id'] == mark_id):
+                logging.info(f"Reached high-water mark of {feed_name} after {index} entries")
+                return entries[:index]
+        return entries
+
+    def load_cached_summaries(self, keys):
+        """Look up cached TL;DRs by cache key and mark them as used."""
+        if not self.summary_cache_size or not keys:
+            return {}
+        keys = list(dict.fromkeys(keys))
+        cached = {}
+        try:
+            with self._get_db() as (conn, cur):
+                for i in range(0, len(keys), SQLITE_CHUNK_SIZE):
+                    chunk = keys[i:i + SQLITE_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cur.execute(
+                        f'SELECT content_hash, tldr FROM summary_cache WHERE content_hash IN ({placeholders})',
+                        chunk
+                    )
+                    for content_hash, tldr in cur.fetchall():
+                        cached[content_hash] = tldr
+                if cached:
+                    with conn:
+                        now = time.time()
+                        cur.executemany(
+                            'UPDATE summary_cache SET last_used = ? WHERE content_hash = ?',
+                            [(now, content_hash) for content_hash in cached]
+                        )
+        except Exception as e:
+            logging.error(f"Error loading cached summaries: {str(e)}")
+        return cached
+
+    def save_cached_summaries(self, rows):
+        """Cache (key, tldr) rows, evicting the least recently used beyond the size limit."""
+        if not self.summary_cache_size or not rows:
+            return
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    now = time.time()
+                    cur.executemany(
+                        'INSERT OR REPLACE INTO summary_cache (content_hash, tldr, last_used) VALUES (?, ?, ?)',
+                        [(key, tldr, now) for key, tldr in rows]
+                    )
+                    cur.execute('SELECT COUNT(*) FROM summary_cache')
+                    excess = cur.fetchone()[0] - self.summary_cache_size
+                    if excess > 0:
+                        cur.execute('''
+                            DELETE FROM summary_cache WHERE content_hash IN (
+                                SELECT content_hash FROM summary_cache ORDER BY last_used LIMIT ?
+                            )
+                        ''', (excess,))
+                        logging.info(f"Evicted {excess} entries from the summary cache")
         except Exception as e:
-            logging.error(f"Error parsing date for entry '{entry.get('title', 'Unknown')}' from feed '{getattr(entry, 'feed', {}).get('title', 'Unknown')}': {str(e)}")
+            logging.error(f"Error saving cached summaries: {str(e)}")
+
+    def find_unseen_entries(self, keys):
+        """Resolve which (feed_name, entry_id) pairs are neither seen nor in the outbox.
+
+        All pairs are looked up with chunked IN queries on the shared connection,
+        one query per feed and chunk, and the set of unseen pairs is returned.
+        """
+        keys = set(keys)
+        if self.from_start or not keys:
+            return keys
+
+        # Keys missing from the filter are definitely new and need no lookup
+        seen_filter = self._get_seen_filter()
+        definitely_new = set()
+        if seen_filter is not None:
+            definitely_new = {key for key in keys if self._filter_key(*key) not in seen_filter}
+
+        ids_by_feed = defaultdict(list)
+        for feed_name, entry_id in keys - definitely_new:
+            ids_by_feed[feed_name].append(entry_id)
+
+        try:
+            seen = set()
+            with self._get_db() as (conn, cur):
+                for feed_name, entry_ids in ids_by_feed.items():
+                    for i in range(0, len(entry_ids), SQLITE_CHUNK_SIZE):
+                        chunk = entry_ids[i:i + SQLITE_CHUNK_SIZE]
+                        placeholders = ','.join('?' * len(chunk))
+                        if self.seen_schema == 'compact':
+                            ids_by_hash = defaultdict(list)
+                            for entry_id in chunk:
+                                ids_by_hash[_entry_hash(entry_id)].append(entry_id)
+                            cur.execute(f'''
+                                SELECT entry_hash FROM seen_hashes
+                                WHERE feed_id = (SELECT feed_id FROM feeds WHERE feed_name = ?)
+                                AND entry_hash IN ({','.join('?' * len(ids_by_hash))})
+                            ''', (feed_name, *ids_by_hash))
+                            seen.update((feed_name, entry_id) for row in cur.fetchall() for entry_id in ids_by_hash[row[0]])
+                            # Entries waiting in the outbox count as seen
+                            cur.execute(
+                                f'SELECT entry_id FROM outbox_entries WHERE feed_name = ? AND entry_id IN ({placeholders})',
+                                (feed_name, *chunk)
+                            )
+                        else:
+                            # Entries waiting in the outbox count as seen
+                            cur.execute(f'''
+                                SELECT entry_id FROM seen_entries WHERE feed_name = ? AND entry_id IN ({placeholders})
+                                UNION
+                                SELECT entry_id FROM outbox_entries WHERE feed_name = ? AND entry_id IN ({placeholders})
+                            ''', (feed_name, *chunk, feed_name, *chunk))
+                        seen.update((feed_name, row[0]) for row in cur.fetchall())
+            return keys - seen
+        except Exception as e:
+            logging.error(f"Error checking for unseen entries: {str(e)}")
+            return keys  # If there's an error, treat them all as new
+
+    def filter_new_entries(self, feed_name, entry_ids):
+        """Return the subset of entry_ids from feed_name that have not been seen yet."""
+        unseen = self.find_unseen_entries((feed_name, entry_id) for entry_id in entry_ids)
+        return {entry_id for _, entry_id in unseen}
+
+    def is_entry_new(self, feed_name, entry):
+        """Check if an entry is new by querying the database."""
+        entry_id = entry.get('id', entry.get('link', ''))
+        
+        if not entry_id:
+            logging.warning(f"No entry ID found for entry from {feed_name}")
+            return True
+            
+        return entry_id in self.filter_new_entries(feed_name, [entry_id])
+
+    def is_entry_recent(self, entry):
+        """Check if a parsed entry record was published within the last RECENT_ENTRY_DAYS days."""
+        published = entry.get('date')
+        if published is None:
+            feed_name = entry.get('feed_name') or entry.get('feed_title', 'Unknown')
+            self.diagnostics.warn(feed_name, 'no date', "No date found for entry '%s' from feed '%s'",
+                                  entry.get('title', 'Unknown'), feed_name)
+            self.diagnostics.dump('Entry without a date', lambda: json.dumps(entry, indent=2, default=str))
             return False
+        time_diff = (datetime.now(timezone.utc) - published).total_seconds()
+        return time_diff <= (RECENT_ENTRY_DAYS * 24 * 60 * 60)
 
     def get_category(self, feed_name, title, content, entry):
         # If the target category is management, always return 'default'
         if self.target_category == 'management':
             return 'default'
-        
-        # First try to get category from feed tags
-        if hasattr(entry, 'tags'):
-            # Map common tag names to our categories based on channel type
-            tag_mapping = {
-                'engineering': {
-                    'go': 'web',
-                    'golang': 'web',
-                    'python': 'web',
-                    'javascript': 'web',
-                    'java': 'web',
-                    'ruby': 'web',
-                    'php': 'web',
-                    'rust': 'web',
-                    'c++': 'web',
-                    'c#': 'web',
-                    'dotnet': 'web',
-                    'node': 'web',
-                    'react': 'web',
-                    'angular': 'web',
-                    'vue': 'web',
-                    'django': 'web',
-                    'flask': 'web',
-                    'spring': 'web',
-                    'rails': 'web',
-                    'laravel': 'web',
-                    'express': 'web',
-                    'nextjs': 'web',
-                    'nuxt': 'web',
-                    'svelte': 'web',
-                    'typescript': 'web',
-                    'swift': 'mobile',
-                    'kotlin': 'mobile',
-                    'android': 'mobile',
-                    'ios': 'mobile',
-                    'flutter': 'mobile',
-                    'reactnative': 'mobile',
-                    'xamarin': 'mobile',
-                    'unity': 'game',
-                    'unreal': 'game',
-                    'godot': 'game',
-                    'gamedev': 'game',
-                    'gaming': 'game',
-                    'ai': 'ai',
-                    'machine-learning': 'ai',
-                    'ml': 'ai',
-                    'artificial-intelligence': 'ai',
-                    'deep-learning': 'ai',
-                    'neural-networks': 'ai',
-                    'tensorflow': 'ai',
-                    'pytorch': 'ai',
-                    'cloud': 'cloud',
-                    'aws': 'cloud',
-                    'azure': 'cloud',
-                    'gcp': 'cloud',
-                    'kubernetes': 'cloud',
-                    'docker': 'cloud',
-                    'devops': 'cloud',
-                    'database': 'database',
-                    'sql': 'database',
-                    'nosql': 'database',
-                    'mongodb': 'database',
-                    'postgresql': 'database',
-                    'mysql': 'database',
-                    'redis': 'database',
-                    'security': 'security',
-                    'cybersecurity': 'security',
-                    'hacking': 'security',
-                    'privacy': 'security',
-                    'design': 'design',
-                    'ui': 'design',
-                    'ux': 'design',
-                    'frontend': 'design',
-                    'css': 'design',
-                    'html': 'design',
-                    'tutorial': 'tutorial',
-                    'how-to': 'tutorial',
-                    'guide': 'tutorial',
-                    'learning': 'tutorial',
-                    'application': 'web',
-                    'app': 'web',
-                    'development': 'web',
-                    'developer': 'web',
-                    'engineering': 'web',
-                    'software': 'web',
-                    'programming': 'web',
-                    'code': 'web',
-                    'architecture': 'architecture',
-                    'architect': 'architecture',
-                    'design-pattern': 'architecture',
-                    'design-patterns': 'architecture',
-                    'system-design': 'architecture',
-                    'microservices': 'architecture',
-                    'distributed-systems': 'architecture',
-                    'scalability': 'architecture',
-                    'performance': 'architecture',
-                    'clean-code': 'architecture',
-                    'clean-architecture': 'architecture',
-                    'ddd': 'architecture',
-                    'domain-driven-design': 'architecture'
-                },
-                'data_analytics': {
-                    'data-engineering': 'data_engineering',
-                    'data-science': 'data_science',
-                    'analytics': 'analytics',
-                    'bi': 'analytics',
-                    'business-intelligence': 'analytics',
-                    'machine-learning': 'ml',
-                    'ml': 'ml',
-                    'artificial-intelligence': 'ai',
-                    'ai': 'ai',
-                    'big-data': 'big_data',
-                    'data-quality': 'data_quality',
-                    'data-governance': 'data_governance',
-                    'data-visualization': 'data_visualization',
-                    'etl': 'data_engineering',
-                    'data-pipeline': 'data_engineering',
-                    'data-warehouse': 'data_engineering',
-                    'data-lake': 'big_data',
-                    'data-modeling': 'data_engineering',
-                    'data-architecture': 'data_engineering',
-                    'data-strategy': 'data_governance',
-                    'data-security': 'data_governance',
-                    'data-privacy': 'data_governance',
-                    'data-ethics': 'data_governance',
-                    'data-ops': 'data_engineering',
-                    'data-mesh': 'data_architecture',
-                    'data-fabric': 'data_architecture',
-                    'data-catalog': 'data_governance',
-                    'data-lineage': 'data_governance',
-                    'data-observability': 'data_quality',
-                    'data-testing': 'data_quality',
-                    'data-validation': 'data_quality',
-                    'data-profiling': 'data_quality',
-                    'data-monitoring': 'data_quality',
-                    'data-analytics': 'analytics',
-                    'data-visualization': 'data_visualization',
-                    'data-storytelling': 'data_visualization',
-                    'data-dashboard': 'data_visualization',
-                    'data-reporting': 'analytics',
-                    'data-metrics': 'analytics',
-                    'data-kpis': 'analytics',
-                    'data-insights': 'analytics',
-                    'data-discovery': 'analytics',
-                    'data-exploration': 'analytics',
-                    'data-mining': 'data_science',
-                    'data-analysis': 'data_science',
-                    'data-science': 'data_science',
-                    'data-scientist': 'data_science',
-                    'data-engineer': 'data_engineering',
-                    'data-analyst': 'analytics',
-                    'data-architect': 'data_architecture',
-                    'data-governance': 'data_governance',
-                    'data-quality': 'data_quality',
-                    'data-visualization': 'data_visualization'
-                },
-                'management': {
-                    'leadership': {
-                        'primary': ['leadership', 'leadership development', 'leadership skills', 'leadership style', 'leadership qualities'],
-                        'secondary': ['executive', 'management style', 'leadership role', 'leadership position'],
-                        'exclude': ['engineering', 'technical', 'software', 'development', 'kubernetes', 'container', 'cloud', 'infrastructure']
-                    },
-                    'team_management': {
-                        'primary': ['team management', 'team building', 'team collaboration'],
-                        'secondary': ['team leadership', 'team development']
-                    },
-                    'product_management': {
-                        'primary': ['product management', 'product development', 'product strategy'],
-                        'secondary': ['product innovation', 'product planning']
-                    },
-                    'project_management': {
-                        'primary': ['project management', 'project planning', 'project execution'],
-                        'secondary': ['project delivery', 'project methodology']
-                    },
-                    'agile': {
-                        'primary': ['agile', 'scrum', 'agile development', 'agile transformation'],
-                        'secondary': ['sprint', 'kanban', 'agile methodology']
-                    },
-                    'strategy': {
-                        'primary': ['strategy', 'strategic planning', 'business strategy'],
-                        'secondary': ['strategic thinking', 'strategic management']
-                    },
-                    'innovation': {
-                        'primary': ['innovation', 'business innovation', 'innovation management'],
-                        'secondary': ['innovative thinking', 'innovation strategy']
-                    },
-                    'culture': {
-                        'primary': ['culture', 'company culture', 'organizational culture'],
-                        'secondary': ['workplace culture', 'cultural transformation']
-                    },
-                    'career': {
-                        'primary': ['career', 'career development', 'career growth'],
-                        'secondary': ['professional development', 'career planning']
-                    }
-                }
-            }
-            
-            # Get the appropriate tag mapping based on the target category
-            channel_type = self.target_category or 'engineering'
-            current_tag_mapping = tag_mapping.get(channel_type, tag_mapping['engineering'])
-            
-            # Check each tag
-            for tag in entry.tags:
-                # Handle both regular tags and CDATA tags
-                tag_term = tag.get('term', '').lower()
-                if not tag_term and hasattr(tag, 'text'):
-                    tag_term = tag.text.lower()
-                
-                # Clean up the tag term
-                tag_term = tag_term.strip()
-                if tag_term.startswith('cdata[') and tag_term.endswith(']'):
-                    tag_term = tag_term[6:-1].strip()
-                
-                if tag_term in current_tag_mapping:
-                    return current_tag_mapping[tag_term]
-                
-                # Try splitting compound tags (e.g., "Web Development" -> ["web", "development"])
-                for word in tag_term.split():
-                    if word in current_tag_mapping:
-                        return current_tag_mapping[word]
-        
-        # If no tags found or no matching tags, fall back to keyword-based categorization
-        text = f"{feed_name} {title} {content}".lower()
-        
-        # Define keywords for each category based on channel type
-        keywords = {
-            'engineering': {
-                'tutorial': {
-                    'primary': ['tutorial', 'guide', 'how to', 'learn', 'step by step', 'hands-on'],
-                    'secondary': ['example', 'demo', 'walkthrough']
-                },
-                'bug': {
-                    'primary': ['bug fix', 'issue fix', 'problem fix', 'error fix', 'debug'],
-                    'secondary': ['bug', 'issue', 'problem', 'error', 'debug']
-                },
-                'security': {
-                    'primary': ['security', 'vulnerability', 'exploit', 'hack', 'breach', 'cyber'],
-                    'secondary': ['secure', 'protect', 'defense']
-                },
-                'release': {
-                    'primary': ['release', 'update', 'version', 'new feature', 'announcement'],
-                    'secondary': ['launch', 'deploy']
-                },
-                'ai': {
-                    'primary': ['artificial intelligence', 'machine learning', 'neural network', 'deep learning'],
-                    'secondary': ['ai model', 'ml model', 'neural', 'deep learning']
-                },
-                'cloud': {
-                    'primary': ['cloud', 'aws', 'azure', 'gcp', 'infrastructure'],
-                    'secondary': ['serverless', 'kubernetes', 'docker']
-                },
-                'database': {
-                    'primary': ['database', 'sql', 'nosql', 'storage', 'query', 'elasticsearch'],
-                    'secondary': ['db', 'data store', 'cache'],
-                    'exclude': ['search', 'application', 'development', 'engineering', 'software']
-                },
-                'mobile': {
-                    'primary': ['mobile', 'ios', 'android', 'app', 'smartphone'],
-                    'secondary': ['flutter', 'react native', 'swift', 'kotlin']
-                },
-                'web': {
-                    'primary': ['web', 'frontend', 'backend', 'javascript', 'react', 'angular', 'application', 'development', 'engineering', 'software'],
-                    'secondary': ['api', 'server', 'client', 'browser', 'programming', 'code']
-                },
-                'game': {
-                    'primary': ['game', 'gaming', 'unity', 'unreal', '3d'],
-                    'secondary': ['game engine', 'graphics', 'physics']
-                },
-                'design': {
-                    'primary': ['design', 'ui', 'ux', 'interface', 'user experience'],
-                    'secondary': ['layout', 'wireframe', 'prototype']
-                },
-                'architecture': {
-                    'primary': ['architecture', 'architect', 'design pattern', 'system design', 'microservices', 'distributed systems', 'scalability', 'clean architecture', 'domain driven design', 'ddd'],
-                    'secondary': ['pattern', 'design principles', 'best practices', 'performance', 'scaling', 'high availability', 'fault tolerance', 'resilience']
-                }
-            },
-            'data_analytics': {
-                'data_engineering': {
-                    'primary': ['data engineering', 'etl', 'data pipeline', 'data warehouse', 'data modeling'],
-                    'secondary': ['data ops', 'data mesh', 'data fabric']
-                },
-                'data_science': {
-                    'primary': ['data science', 'data mining', 'data analysis', 'statistical analysis'],
-                    'secondary': ['predictive modeling', 'data scientist']
-                },
-                'analytics': {
-                    'primary': ['analytics', 'business intelligence', 'bi', 'data analytics'],
-                    'secondary': ['reporting', 'metrics', 'kpis', 'insights']
-                },
-                'ml': {
-                    'primary': ['machine learning', 'ml', 'predictive analytics'],
-                    'secondary': ['model training', 'model deployment']
-                },
-                'ai': {
-                    'primary': ['artificial intelligence', 'ai', 'deep learning'],
-                    'secondary': ['neural networks', 'cognitive computing']
-                },
-                'big_data': {
-                    'primary': ['big data', 'data lake', 'hadoop', 'spark'],
-                    'secondary': ['distributed computing', 'data processing']
-                },
-                'data_quality': {
-                    'primary': ['data quality', 'data testing', 'data validation'],
-                    'secondary': ['data profiling', 'data monitoring']
-                },
-                'data_governance': {
-                    'primary': ['data governance', 'data strategy', 'data security'],
-                    'secondary': ['data privacy', 'data ethics']
-                },
-                'data_visualization': {
-                    'primary': ['data visualization', 'data storytelling', 'dashboard'],
-                    'secondary': ['charts', 'graphs', 'reports']
-                }
-            },
-            'management': {
-                'leadership': {
-                    'primary': ['leadership', 'leadership development', 'leadership skills', 'leadership style', 'leadership qualities'],
-                    'secondary': ['executive', 'management style', 'leadership role', 'leadership position'],
-                    'exclude': ['engineering', 'technical', 'software', 'development', 'kubernetes', 'container', 'cloud', 'infrastructure']
-                },
-                'team_management': {
-                    'primary': ['team management', 'team building', 'team collaboration'],
-                    'secondary': ['team leadership', 'team development']
-                },
-                'product_management': {
-                    'primary': ['product management', 'product development', 'product strategy'],
-                    'secondary': ['product innovation', 'product planning']
-                },
-                'project_management': {
-                    'primary': ['project management', 'project planning', 'project execution'],
-                    'secondary': ['project delivery', 'project methodology']
-                },
-                'agile': {
-                    'primary': ['agile', 'scrum', 'agile development', 'agile transformation'],
-                    'secondary': ['sprint', 'kanban', 'agile methodology']
-                },
-                'strategy': {
-                    'primary': ['strategy', 'strategic planning', 'business strategy'],
-                    'secondary': ['strategic thinking', 'strategic management']
-                },
-                'innovation': {
-                    'primary': ['innovation', 'business innovation', 'innovation management'],
-                    'secondary': ['innovative thinking', 'innovation strategy']
-                },
-                'culture': {
-                    'primary': ['culture', 'company culture', 'organizational culture'],
-                    'secondary': ['workplace culture', 'cultural transformation']
-                },
-                'career': {
-                    'primary': ['career', 'career development', 'career growth'],
-                    'secondary': ['professional development', 'career planning']
-                }
-            }
-        }
-        
-        # Get the appropriate keywords based on the target category
-        channel_type = self.target_category or 'engineering'
-        current_keywords = keywords.get(channel_type, keywords['engineering'])
-        
-        # Score each category
-        category_scores = {}
-        for category, keyword_sets in current_keywords.items():
-            if category == 'default':
-                continue
-                
-            score = 0
-            # Check primary keywords (higher weight)
-            for keyword in keyword_sets['primary']:
-                if keyword in text:
-                    score += 2
-            # Check secondary keywords (lower weight)
-            for keyword in keyword_sets['secondary']:
-                if keyword in text:
-                    score += 1
-                    
-            # Apply exclusion rules
-            if 'exclude' in keyword_sets:
-                for keyword in keyword_sets['exclude']:
-                    if keyword in text:
-                        score = 0
-                        break
-                    
-            category_scores[category] = score
-        
-        # Get the category with the highest score
-        if category_scores:
-            max_score = max(category_scores.values())
-            if max_score > 0:
-                # Get all categories with the max score
-                top_categories = [cat for cat, score in category_scores.items() if score == max_score]
-                # If there's a tie, prefer certain categories based on channel type
-                if channel_type == 'engineering':
-                    priority_order = ['tutorial', 'web', 'cloud', 'database', 'ai', 'security', 'release', 'bug', 
-                                    'mobile', 'game', 'design', 'architecture']
-                elif channel_type == 'data_analytics':
-                    priority_order = ['data_engineering', 'data_science', 'analytics', 'ml', 'ai', 'big_data',
-                                    'data_quality', 'data_governance', 'data_visualization']
-                else:  # management
-                    priority_order = ['leadership', 'team_management', 'product_management', 'project_management',
-                                    'agile', 'strategy', 'innovation', 'culture', 'career']
-                
-                for category in priority_order:
-                    if category in top_categories:
-                        return category
-                
-        return 'default'
+        return classify_entry(self.target_category or 'engineering', feed_name, title, content, _entry_tags(entry))
 
     async def send_category_header(self, channel, category):
         if not hasattr(self, '_last_category') or self._last_category != category:
             # Create a more prominent header
             header_text = f"# {self.categories[category]['icon']} {self.categories[category]['name']}"
-            embed = discord.Embed(
-                title=header_text,
-                color=discord.Color.blue()
-            )
+            embed = {
+                'title': header_text,
+                'color': DISCORD_BLUE
+            }
             
-            await channel.send(embed=embed)
+            await self.sender.send(channel, embed=embed)
             self._last_category = category
-            await asyncio.sleep(1)  # Small delay after header
 
     async def send_category_section(self, channel, category, entries, include_date=None):
         if not entries:
@@ -1131,32 +2924,32 @@ class RSSMonitor(discord.Client):
         if include_date:
             header_text = f"📅 {include_date}\n\n{header_text}"
             
-        embed = discord.Embed(
-            title=header_text,
-            color=discord.Color.blue()
-        )
-        embed.description = "\n\n"
+        embed = {
+            'title': header_text,
+            'color': DISCORD_BLUE,
+            'description': "\n\n"
+        }
 
         # Add all entries for this category
         for feed_name, entry in entries:
-            icon = self.get_icon(feed_name, entry.title)
-            tldr = self.get_tldr(entry)
+            icon = self.get_icon(feed_name, entry['title'])
+            tldr = entry.get('tldr')
             
             # Format the entry
-            entry_text = f"**{icon} [{entry.title}]({entry.link})**\n"
+            entry_text = f"**{icon} [{entry['title']}]({entry['link']})**\n"
             entry_text += f"*From: {feed_name}*\n"
             
             if tldr:
                 entry_text += f"\n{tldr}\n"
             
             try:
-                published = datetime(*entry.published_parsed[:6])
+                published = datetime(*entry['published'])
                 entry_text += f"\n*Published: {published.strftime('%Y-%m-%d %H:%M:%S')}*\n"
             except (AttributeError, TypeError):
                 pass
             
             # Add ChatGPT link
-            prompt = f"Please summarize this article in approximately 100 words and add key learning points: {entry.title} - {entry.link}"
+            prompt = f"Please summarize this article in approximately 100 words and add key learning points: {entry['title']} - {entry['link']}"
             encoded_prompt = quote(prompt)
             chatgpt_url = f"https://chat.openai.com?prompt={encoded_prompt}"
             entry_text += f"\n[🤖 Ask ChatGPT to summarize this article]({chatgpt_url})\n"
@@ -1165,75 +2958,194 @@ class RSSMonitor(discord.Client):
             entry_text += "\n" + "•" * 3 + "\n\n"
             
             # Add to embed if it fits, otherwise send current embed and start a new one
-            if len(embed.description) + len(entry_text) > 4000:  # Discord's limit
-                try:
-                    await asyncio.wait_for(channel.send(embed=embed), timeout=1.0)
-                except asyncio.TimeoutError:
-                    logging.error(f"Timeout while sending message to channel {channel.id}")
-                except Exception as e:
-                    logging.error(f"Error sending message to channel {channel.id}: {str(e)}")
+            if len(embed['description']) + len(entry_text) > 4000:  # Discord's limit
+                await self.sender.send(channel, embed=embed)
                     
-                embed = discord.Embed(
-                    title=header_text,
-                    color=discord.Color.blue()
-                )
-                embed.description = "\n\n"  # Just add some spacing
+                embed = {
+                    'title': header_text,
+                    'color': DISCORD_BLUE,
+                    'description': "\n\n"  # Just add some spacing
+                }
             
-            embed.description += entry_text
+            embed['description'] += entry_text
 
         # Send the final embed for this category
-        try:
-            await asyncio.wait_for(channel.send(embed=embed), timeout=1.0)
-        except asyncio.TimeoutError:
-            logging.error(f"Timeout while sending final message to channel {channel.id}")
-        except Exception as e:
-            logging.error(f"Error sending final message to channel {channel.id}: {str(e)}")
+        await self.sender.send(channel, embed=embed)
 
-    async def fetch_feed(self, feed_url):
-        try:
-            headers = {
-                'User-Agent': 'curl/8.5.0',
-                'Accept': '*/*'
-            }
-            
-            # Use aiohttp session if available
-            if self._session and not self._closed:
+    def _get_host_semaphore(self, url):
+        """Get the semaphore limiting concurrent fetches to the host of url."""
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_fetches_per_host)
+        return self._host_semaphores[host]
+
+    async def _fetch_feed_content(self, feed):
+        """Fetch the body of a single feed, bounded by the global and per-host limits.
+
+        Feeds whose circuit breaker is open are skipped. Timeouts, connection
+        errors and server errors are retried with backoff, except for feeds
+        that are already failing, which get a single attempt as a probe.
+        """
+        if self.feed_circuit_open(feed['name']):
+            logging.info(f"Skipping feed {feed['name']} after repeated failures")
+            self.stats.counts['feeds_circuit_open'] += 1
+            return None
+        
+        headers = {
+            'User-Agent': 'curl/8.5.0',
+            'Accept': '*/*'
+        }
+        # Make the request conditional on the validators from the previous run
+        feed_state = self._feed_states.get(feed['name'], {})
+        if feed_state.get('etag'):
+            headers['If-None-Match'] = feed_state['etag']
+        if feed_state.get('last_modified'):
+            headers['If-Modified-Since'] = feed_state['last_modified']
+        
+        failing = self._feed_health.get(feed['name'], {}).get('consecutive_failures')
+        attempts = 1 if failing else self.fetch_retries + 1
+        for attempt in range(1, attempts + 1):
+            # Take the host slot first, so feeds queued on a busy host do not hold global slots
+            async with self._get_host_semaphore(feed['url']), self._fetch_semaphore:
+                logging.info(f"Fetching feed: {feed['name']} ({feed['url']})")
+                start = time.monotonic()
+                retryable = True
                 try:
-                    async with self._session.get(feed_url, headers=headers, timeout=20, allow_redirects=True) as response:
-                        response.raise_for_status()
-                        content = await response.read()
-                        content_type = response.headers.get('content-type', '').lower()
-                        if not any(xml_type in content_type for xml_type in ['xml', 'rss', 'atom']):
-                            logging.warning(f"Response from {feed_url} doesn't appear to be an RSS feed (content-type: {content_type})")
+                    async with self._session.get(feed['url'], headers=headers, timeout=10) as response:
+                        logging.info(f"Response status for {feed['name']}: {response.status}")
+                        logging.debug("Response headers for %s: %s", feed['name'], LazyRepr(lambda: dict(response.headers)))
+                        if response.status == 304:
+                            logging.info(f"Feed {feed['name']} not modified since last run")
+                            self.record_fetch_result(feed['name'], True, '304', time.monotonic() - start)
+                            self.stats.counts['feeds_not_modified'] += 1
                             return None
-                        logging.info(f"Feed response from {feed_url}:\n{content[:500]}...")  # Show first 500 chars
-                        return feedparser.parse(content)
+                        if response.status == 200:
+                            body = await response.read()
+                            content = await response.text()
+                            self.record_fetch_result(feed['name'], True, '200', time.monotonic() - start)
+                            self.stats.counts['feeds_fetched'] += 1
+                            self.stats.counts['bytes_downloaded'] += len(body)
+                            logging.debug("Feed response from %s:\n%s...", feed['name'], LazyRepr(lambda: content[:500]))
+                            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                            if etag or last_modified:
+                                self.update_feed_state(feed['name'], etag=etag, last_modified=last_modified)
+                            return content
+                        status = f"HTTP {response.status}"
+                        retryable = response.status >= 500 or response.status == 429
+                        logging.error(f"Failed to fetch {feed['name']}: HTTP {response.status}")
+                except asyncio.TimeoutError:
+                    status = 'timeout'
+                    logging.error(f"Timeout while fetching feed {feed['name']}")
+                except aiohttp.ClientError as e:
+                    status = f"error: {str(e)}"
+                    logging.error(f"Error fetching feed {feed['name']}: {str(e)}")
                 except Exception as e:
-                    logging.warning(f"Failed to fetch {feed_url} with aiohttp: {str(e)}")
-                    # Fall through to requests
+                    status = f"error: {str(e)}"
+                    retryable = False
+                    logging.error(f"Error fetching feed {feed['name']}: {str(e)}")
+                finally:
+                    # Only the request itself, without the waits for the limits and retries
+                    self.stats.record('fetch', time.monotonic() - start, feed=feed['name'])
+            if not retryable or attempt == attempts:
+                break
+            delay = 2 ** (attempt - 1)
+            logging.warning(f"Retrying {feed['name']} in {delay}s (attempt {attempt} of {attempts})")
+            await asyncio.sleep(delay)
+            self.stats.record('fetch_retry_wait', delay, feed=feed['name'])
+        self.record_fetch_result(feed['name'], False, status)
+        self.stats.counts['feeds_failed'] += 1
+        return None
 
-            # Fallback to requests
-            response = requests.get(feed_url, timeout=20, headers=headers, verify=True, allow_redirects=True)
-            response.raise_for_status()
-            
-            content_type = response.headers.get('content-type', '').lower()
-            if not any(xml_type in content_type for xml_type in ['xml', 'rss', 'atom']):
-                logging.warning(f"Response from {feed_url} doesn't appear to be an RSS feed (content-type: {content_type})")
-                return None
-                
-            return feedparser.parse(response.content)
-        except (requests.RequestException, socket.gaierror) as e:
-            logging.warning(f"Failed to fetch {feed_url} with requests: {str(e)}")
-            try:
-                # Fallback to feedparser's direct parsing with a timeout
-                return feedparser.parse(feed_url, agent=headers['User-Agent'])
-            except Exception as e:
-                logging.error(f"Failed to parse feed {feed_url}: {str(e)}")
-                return None
+    def prepare_fetches(self, feeds):
+        """Set up the fetch limits and load the stored state of the feeds about to be fetched."""
+        self._fetch_semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        self._host_semaphores = {}
+        feeds = list(feeds)
+        # Processing every entry again needs the full feed bodies
+        self._feed_states = {} if self.from_start else self.load_feed_states(feed['name'] for feed in feeds)
+        self._feed_health = self.load_feed_health(feed['name'] for feed in feeds)
+
+    async def fetch_and_parse_feed(self, feed):
+        """Fetch a feed and parse it into entry records, or None if either step failed."""
+        content = await self._fetch_feed_content(feed)
+        return await self.parse_feed(feed, content)
+
+    def _get_executor(self):
+        """Get the worker pool for CPU-bound work, creating it on first use."""
+        if self._executor is None:
+            if self.executor_type == 'process':
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.executor_workers, initializer=setup_worker_logging,
+                    initargs=(self.config['settings']['log_file'], self.config['settings'].get('log_level', 'INFO'))
+                )
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.executor_workers, thread_name_prefix='rss-worker'
+                )
+            logging.info(f"Started {self.executor_type} worker pool")
+        return self._executor
+
+    async def _run_in_executor(self, func, *args):
+        """Run func(*args) in the worker pool without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+
+    async def parse_feed(self, feed, content):
+        """Parse a fetched feed body into entry records in the worker pool."""
+        if content is None:
+            return None
+        try:
+            date_hint = self._feed_states.get(feed['name'], {}).get('date_hint')
+            with self.stats.span('parse', feed=feed['name']):
+                records, hints, new_date_hint = await self._run_in_executor(parse_feed_entries, content, date_hint)
+            self.stats.counts['entries_parsed'] += len(records)
+            self._poll_hints[feed['name']] = hints
+            self._poll_timestamps[feed['name']] = [record['timestamp'] for record in records]
+            if new_date_hint != date_hint:
+                self.update_feed_state(feed['name'], date_hint=new_date_hint)
+            return records
         except Exception as e:
-            logging.error(f"Unexpected error fetching feed {feed_url}: {str(e)}")
+            logging.error(f"Error parsing feed {feed['name']}: {str(e)}")
             return None
 
+    async def summarize_feed_entries(self, feed_name, entries, channel_type):
+        """Summarize the new entries of a feed.
+
+        Entries found in the summary cache are filled in directly; only the
+        rest are sent to the worker pool.
+        """
+        keys = [summary_cache_key(entry, self.html_backend, self.sentence_splitter) for entry in entries]
+        cached = self.load_cached_summaries(keys)
+        misses = []
+        for entry, key in zip(entries, keys):
+            if key in cached:
+                entry['tldr'] = cached[key]
+            else:
+                misses.append((entry, key))
+        if cached:
+            logging.info(f"Summary cache hits for {feed_name}: {len(entries) - len(misses)} of {len(entries)}")
+            self.stats.counts['summary_cache_hits'] += len(entries) - len(misses)
+        if not misses:
+            return entries
+
+        try:
+            with self.stats.span('summarize', feed=feed_name, channel=channel_type):
+                summarized = await self._run_in_executor(
+                    summarize_entries, [entry for entry, _ in misses], self.html_backend, self.sentence_splitter
+                )
+        except Exception as e:
+            logging.error(f"Error summarizing entries from {feed_name}: {str(e)}")
+            for entry in entries:
+                entry.setdefault('tldr', None)
+            return entries
+
+        # The process pool returns copies, so copy the results back
+        for (entry, key), result in zip(misses, summarized):
+            entry['tldr'] = result['tldr']
+            for stage, seconds in result.pop('timings', {}).items():
+                self.stats.record(stage, seconds, feed=feed_name)
+        self.save_cached_summaries([(key, entry['tldr']) for entry, key in misses])
+        return entries
+
     def get_category_order(self, channel_type):
         """Get the ordered list of categories for a channel type."""
         if channel_type == 'engineering':
@@ -1252,176 +3164,443 @@ class RSSMonitor(discord.Client):
                 'agile', 'strategy', 'innovation', 'culture', 'career', 'default'
             ]
 
-    async def check_all_feeds(self):
-        """Check all feeds for new entries"""
+    async def queue_new_entries(self, channel_type, feeds, queue):
+        """Dedup stage: find the new entries of each fetched feed, in config order.
+
+        The feeds are fetched and parsed at most fetch_window ahead of the one
+        being checked, so only that many feeds' entries are held at a time. The
+        new entries of each feed are claimed for this run and put on queue as
+        (feed_name, task summarizing them), followed by None once every feed is
+        done. Feeds with new entries are released by the send stage once they
+        are in the outbox, so a crash before that refetches them.
+        """
+        pending = iter(feeds)
+        fetches = deque()
         try:
-            await self._init_session()
-            
-            # Get the categories to process
-            categories_to_process = [self.target_category] if self.target_category else self.feeds.keys()
-            logging.info(f"Processing categories: {categories_to_process}")
-            
-            for channel_type in categories_to_process:
-                if channel_type not in self.feeds:
-                    logging.error(f"Category '{channel_type}' not found in feeds configuration")
+            while True:
+                while len(fetches) < self.fetch_window and (feed := next(pending, None)) is not None:
+                    fetches.append((feed, asyncio.create_task(self.fetch_and_parse_feed(feed))))
+                if not fetches:
+                    break
+                feed, fetch = fetches.popleft()
+                all_entries = await fetch
+                if all_entries is None:
+                    self.release_feed_state(feed['name'], save=False)
                     continue
+                dedup_start = time.perf_counter()
+                try:
+                    if not all_entries:
+                        logging.warning(f"No entries found in feed: {feed['name']}")
+                        self.release_feed_state(feed['name'])
+                        continue
+                        
+                    entries = self.entries_above_high_water_mark(feed['name'], all_entries)
+                    logging.info(f"Processing {len(entries)} of {len(all_entries)} entries from {feed['name']}")
+                    self.stats.skipped['high_water_mark'] += len(all_entries) - len(entries)
                     
-                # Get channel for this category
-                if channel_type not in self.channels:
-                    logging.error(f"No channel configuration found for {channel_type}")
-                    continue
+                    # Look up every remaining entry of the feed in one batch
+                    entry_ids = [entry['id'] for entry in entries]
+                    unseen_ids = self.filter_new_entries(feed['name'], [entry_id for entry_id in entry_ids if entry_id])
+                    
+                    recent_entries = []
+                    for entry, entry_id in zip(entries, entry_ids):
+                        if entry_id and entry_id not in unseen_ids:
+                            self.stats.skipped['seen'] += 1
+                            continue
+                        if entry_id and (feed['name'], entry_id) in self._claimed_entries:
+                            self.stats.skipped['claimed'] += 1
+                            continue
+                        if not entry_id:
+                            self.diagnostics.warn(feed['name'], 'no id', "No entry ID found for entry from %s", feed['name'])
+                        else:
+                            # Only the first occurrence of a duplicated id is new
+                            unseen_ids.discard(entry_id)
+                        entry['feed_name'] = feed['name']
+                        if self.is_entry_recent(entry):
+                            recent_entries.append(entry)
+                        else:
+                            self.stats.skipped['not_recent'] += 1
+                    
+                    duplicates = {}
+                    if self.cross_feed_dedup and recent_entries:
+                        # SimHash the unseen entries in the worker pool, then look up their duplicates in one batch
+                        with self.stats.span('simhash', feed=feed['name']):
+                            fingerprints = await self._run_in_executor(
+                                fingerprint_entries, [(entry['title'], entry['content']) for entry in recent_entries]
+                            )
+                        for entry, fingerprint in zip(recent_entries, fingerprints):
+                            entry['simhash'] = fingerprint
+                        duplicates = self.find_duplicates(feed['name'], recent_entries)
+                    new_entries = []
+                    for index, entry in enumerate(recent_entries):
+                        if entry['id'] and (feed['name'], entry['id']) in self._claimed_entries:
+                            # Claimed by another channel while the fingerprints were computed
+                            self.stats.skipped['claimed'] += 1
+                            continue
+                        if index in duplicates:
+                            duplicate = duplicates[index]
+                            logging.info(f"Skipping entry in {feed['name']} that duplicates {duplicate[1]} "
+                                         f"from {duplicate[0]}: {entry['title'] or 'No title'}")
+                            self.stats.skipped['duplicate'] += 1
+                            continue
+                        logging.info(f"New entry found in {feed['name']}: {entry['title'] or 'No title'}")
+                        new_entries.append(entry)
+                        if entry['id']:
+                            self._claimed_entries.add((feed['name'], entry['id']))
+                    if self.cross_feed_dedup and new_entries:
+                        self.record_fingerprints(new_entries)
                     
-                channel_id = self.channels[channel_type]['id']
-                channel = self.get_channel(int(channel_id))
-                if not channel:
-                    logging.error(f"Could not find channel with ID {channel_id}")
+                    self.stats.counts['entries_new'] += len(new_entries)
+                    if not new_entries:
+                        self.release_feed_state(feed['name'])
+                except Exception as e:
+                    logging.error(f"Error checking feed {feed['name']}: {str(e)}")
+                    logging.error(f"Stack trace:\n{traceback.format_exc()}")
+                    self.release_feed_state(feed['name'], save=False)
                     continue
+                finally:
+                    self.stats.record('dedup', time.perf_counter() - dedup_start, feed=feed['name'], channel=channel_type)
                 
-                logging.info(f"Processing channel: {channel_type} (ID: {channel_id})")
-                
-                # Dictionary to store entries by feed source
-                feed_entries = defaultdict(list)
-                
-                # Process each feed in this category
-                for feed in self.feeds[channel_type]:
-                    if isinstance(feed, dict) and 'name' in feed and 'url' in feed:
-                        logging.info(f"Fetching feed: {feed['name']} ({feed['url']})")
-                        try:
-                            headers = {
-                                'User-Agent': 'curl/8.5.0',
-                                'Accept': '*/*'
-                            }
-                            async with self._session.get(feed['url'], headers=headers, timeout=10) as response:
-                                logging.info(f"Response status for {feed['name']}: {response.status}")
-                                logging.info(f"Response headers for {feed['name']}: {dict(response.headers)}")
-                                if response.status == 200:
-                                    content = await response.text()
-                                    logging.info(f"Feed response from {feed['name']}:\n{content[:500]}...")  # Show first 500 chars
-                                    feed_data = feedparser.parse(content)
-                                    
-                                    if not feed_data.entries:
-                                        logging.warning(f"No entries found in feed: {feed['name']}")
-                                        continue
-                                        
-                                    logging.info(f"Processing {len(feed_data.entries)} entries from {feed['name']}")
-                                    
-                                    for entry in feed_data.entries:
-                                        if self.is_entry_new(feed['name'], entry) and self.is_entry_recent(entry):
-                                            logging.info(f"New entry found in {feed['name']}: {entry.get('title', 'No title')}")
-                                            feed_entries[feed['name']].append(entry)
-                                            # Save to seen entries
-                                            self.seen_entries[feed['name']].append(entry.get('id', entry.get('link', '')))
-                                            self.save_seen_entries()
-                                else:
-                                    logging.error(f"Failed to fetch {feed['name']}: HTTP {response.status}")
-                                            
-                        except asyncio.TimeoutError:
-                            logging.error(f"Timeout while fetching feed {feed['name']}")
-                        except Exception as e:
-                            logging.error(f"Error checking feed {feed['name']}: {str(e)}")
-                            import traceback
-                            logging.error(f"Stack trace:\n{traceback.format_exc()}")
-                
-                # Only send header and process entries if there are new entries
-                if feed_entries:
-                    logging.info(f"Found new entries for {channel_type}: {sum(len(entries) for entries in feed_entries.values())} total entries")
-                    # Send date header for this channel
+                if new_entries:
+                    # Summarize in the worker pool while the next feeds are checked;
+                    # the bounded queue limits how many feeds are in flight
+                    summarize = asyncio.create_task(self.summarize_feed_entries(feed['name'], new_entries, channel_type))
+                    await queue.put((feed['name'], summarize))
+        finally:
+            for _, fetch in fetches:
+                fetch.cancel()
+            await queue.put(None)
+
+    def format_entry(self, feed_name, entry):
+        """Format an entry as the markdown text of a feed embed."""
+        icon = self.get_icon(feed_name, entry['title'])
+        tldr = entry['tldr']
+        
+        # Format the entry
+        entry_text = f"**{icon} [{entry['title']}]({entry['link']})**\n"
+        
+        if tldr:
+            entry_text += f"{tldr}\n"
+        
+        try:
+            published = datetime(*entry['published'])
+            entry_text += f"*Published: {published.strftime('%Y-%m-%d %H:%M:%S')}*\n"
+        except (AttributeError, TypeError):
+            pass
+
+        # Add ChatGPT link
+        prompt = f"Please summarize this article in approximately 100 words and add key learning points: {entry['title']} - {entry['link']}"
+        encoded_prompt = quote(prompt)
+        chatgpt_url = f"https://chat.openai.com?prompt={encoded_prompt}"
+        entry_text += f"[🤖 Ask ChatGPT to summarize]({chatgpt_url})\n"
+        
+        # Add divider between entries
+        entry_text += "\n" + "•" * 3 + "\n\n"
+        return entry_text
+
+    async def send_outbox_message(self, channel_type, channel, message_id, embeds):
+        """Send an outbox message and record the outcome; returns whether it was delivered."""
+        with self.stats.span('send', channel=channel_type):
+            message = await self.sender.send(channel, embeds=embeds)
+        if message is None:
+            self.mark_message_failed(message_id)
+            self.stats.counts['messages_failed'] += 1
+            return False
+        self.mark_message_sent(message_id)
+        self.stats.counts['messages_sent'] += 1
+        return True
+
+    async def drain_outbox(self, channel_type, channel):
+        """Send the messages left in the outbox by earlier runs, oldest first."""
+        messages = self.load_outbox(channel_type)
+        if not messages:
+            return
+        logging.info(f"Resending {len(messages)} messages from the outbox for {channel_type}")
+        sent = 0
+        for message_id, embeds in messages:
+            sent += await self.send_outbox_message(channel_type, channel, message_id, embeds)
+        logging.info(f"Resent {sent} of {len(messages)} outbox messages for {channel_type}")
+
+    async def post_queued_entries(self, channel_type, channel, queue):
+        """Send stage: post a channel's entries from queue as they are summarized.
+
+        Messages left in the outbox by earlier runs go first. Then a date header
+        opens the first message, and the entries are grouped by feed and packed
+        into multi-embed messages. Each message is stored in the outbox and sent
+        as soon as it is full, so only the last one is held until the queue is done.
+        """
+        await self.drain_outbox(channel_type, channel)
+        
+        packer = None
+        total = 0
+        sent = 0
+        queued_feeds = []
+        # Feeds with entries in a message that could not be stored in the outbox
+        unstored_feeds = set()
+        
+        async def send_messages(messages):
+            nonlocal sent
+            for embeds, keys in messages:
+                message_id = self.enqueue_message(channel_type, embeds, keys)
+                if message_id is None:
+                    # Their feed state stays unsaved, so the entries are found again on the next run
+                    unstored_feeds.update(feed_name for feed_name, _ in keys)
+                    continue
+                sent += await self.send_outbox_message(channel_type, channel, message_id, embeds)
+        
+        while (item := await queue.get()) is not None:
+            feed_name, summarize = item
+            try:
+                entries = await summarize
+                if packer is None:
                     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    header_embed = discord.Embed(
-                        title="📅 New tech blog posts are here!",
-                        description=f"*Posted on {current_time}*",
-                        color=discord.Color.blue()
-                    )
-                    try:
-                        await asyncio.wait_for(channel.send(embed=header_embed), timeout=1.0)
-                        await asyncio.sleep(1)  # Small delay after header
-                    except asyncio.TimeoutError:
-                        logging.error(f"Timeout while sending header to channel {channel.id}")
-                    except Exception as e:
-                        logging.error(f"Error sending header to channel {channel.id}: {str(e)}")
-                    
-                    # Send entries grouped by feed source in batches of 4
-                    for feed_name, entries in feed_entries.items():
-                        if entries:
-                            logging.info(f"Sending {len(entries)} entries from {feed_name}")
-                            # Process entries in batches of 4
-                            for i in range(0, len(entries), 4):
-                                batch = entries[i:i+4]
-                                logging.info(f"Sending batch {i//4 + 1} of {(len(entries) + 3)//4} for {feed_name}")
-                                
-                                # Create feed header and batch message
-                                embed = discord.Embed(
-                                    title=f"📰 {feed_name}",
-                                    color=discord.Color.blue()
-                                )
-                                
-                                # Add entries to the embed
-                                for entry in batch:
-                                    icon = self.get_icon(feed_name, entry.title)
-                                    tldr = self.get_tldr(entry)
-                                    
-                                    # Format the entry
-                                    entry_text = f"**{icon} [{entry.title}]({entry.link})**\n"
-                                    
-                                    if tldr:
-                                        entry_text += f"{tldr}\n"
-                                    
-                                    try:
-                                        published = datetime(*entry.published_parsed[:6])
-                                        entry_text += f"*Published: {published.strftime('%Y-%m-%d %H:%M:%S')}*\n"
-                                    except (AttributeError, TypeError):
-                                        pass
-
-                                    # Add ChatGPT link
-                                    prompt = f"Please summarize this article in approximately 100 words and add key learning points: {entry.title} - {entry.link}"
-                                    encoded_prompt = quote(prompt)
-                                    chatgpt_url = f"https://chat.openai.com?prompt={encoded_prompt}"
-                                    entry_text += f"[🤖 Ask ChatGPT to summarize]({chatgpt_url})\n"
-                                    
-                                    # Add divider between entries
-                                    entry_text += "\n" + "•" * 3 + "\n\n"
-                                    
-                                    # Add to embed description
-                                    if len(embed.description or "") + len(entry_text) > 4000:  # Discord's limit
-                                        # Send current embed and start a new one
-                                        try:
-                                            await asyncio.wait_for(channel.send(embed=embed), timeout=1.0)
-                                            await asyncio.sleep(1.5)  # Sleep between messages
-                                        except asyncio.TimeoutError:
-                                            logging.error(f"Timeout while sending message to channel {channel.id}")
-                                        except Exception as e:
-                                            logging.error(f"Error sending message to channel {channel.id}: {str(e)}")
-                                        
-                                        # Create new embed with feed header
-                                        embed = discord.Embed(
-                                            title=f"📰 {feed_name} (continued)",
-                                            color=discord.Color.blue()
-                                        )
-                                    
-                                    # Add entry to embed description
-                                    if embed.description is None:
-                                        embed.description = entry_text
-                                    else:
-                                        embed.description += entry_text
-                                
-                                # Send the final embed for this batch
-                                try:
-                                    await asyncio.wait_for(channel.send(embed=embed), timeout=1.0)
-                                    await asyncio.sleep(1.5)  # Sleep between messages
-                                except asyncio.TimeoutError:
-                                    logging.error(f"Timeout while sending message to channel {channel.id}")
-                                except Exception as e:
-                                    logging.error(f"Error sending message to channel {channel.id}: {str(e)}")
-                else:
-                    logging.info(f"No new entries found for {channel_type}")
+                    header_embed = {
+                        'title': "📅 New tech blog posts are here!",
+                        'description': f"*Posted on {current_time}*",
+                        'color': DISCORD_BLUE
+                    }
+                    packer = EmbedPacker(header=header_embed, color=DISCORD_BLUE)
+                logging.info(f"Sending {len(entries)} entries from {feed_name}")
+                total += len(entries)
+                await send_messages(packer.add_section(
+                    f"📰 {feed_name}",
+                    [self.format_entry(feed_name, entry) for entry in entries],
+                    [(feed_name, entry['id']) for entry in entries],
+                ))
+                queued_feeds.append(feed_name)
+            except Exception as e:
+                logging.error(f"Error posting entries from {feed_name}: {str(e)}")
+                logging.error(f"Stack trace:\n{traceback.format_exc()}")
+                self.release_feed_state(feed_name, save=False)
+        
+        if packer is None:
+            logging.info(f"No new entries found for {channel_type}")
+            return
+        await send_messages(packer.finish())
+        # The feeds whose new entries are all in the outbox now can move on
+        for feed_name in queued_feeds:
+            self.release_feed_state(feed_name, save=feed_name not in unstored_feeds)
+        logging.info(f"Sent {sent} messages with {total} new entries for {channel_type} to channel {channel.id}")
+
+    async def process_channel(self, channel_type, channel, feeds):
+        """Check a channel's feeds and post their new entries.
+
+        The dedup and send stages run concurrently, joined by a bounded queue,
+        so the channel starts posting while its later feeds are still being
+        fetched and summarized.
+        """
+        queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        with self.stats.span('channel', channel=channel_type):
+            await asyncio.gather(
+                self.queue_new_entries(channel_type, feeds, queue),
+                self.post_queued_entries(channel_type, channel, queue),
+            )
+
+    def resolve_channel_jobs(self):
+        """Resolve the channel of every channel type to process.
+
+        Returns a list of (channel_type, channel_id, channel).
+        """
+        # Get the categories to process
+        categories_to_process = [self.target_category] if self.target_category else self.feeds.keys()
+        logging.info(f"Processing categories: {categories_to_process}")
+        
+        channel_jobs = []
+        for channel_type in categories_to_process:
+            if channel_type not in self.feeds:
+                logging.error(f"Category '{channel_type}' not found in feeds configuration")
+                continue
+                
+            # Get channel for this category
+            if channel_type not in self.channels:
+                logging.error(f"No channel configuration found for {channel_type}")
+                continue
                 
+            channel_id = self.channels[channel_type]['id']
+            channel = self.resolve_channel(channel_type, channel_id)
+            if not channel:
+                logging.error(f"Could not find channel with ID {channel_id}")
+                continue
+            
+            channel_jobs.append((channel_type, channel_id, channel))
+        return channel_jobs
+
+    def feeds_of_channels(self, channel_jobs):
+        """List the configured feeds of the resolved channels as (channel_type, feed)."""
+        return [
+            (channel_type, feed)
+            for channel_type, _, _ in channel_jobs
+            for feed in self.feeds[channel_type]
+            if isinstance(feed, dict) and 'name' in feed and 'url' in feed
+        ]
+
+    async def check_feeds(self, channel_jobs, feeds_to_fetch):
+        """Fetch feeds_to_fetch, a list of (channel_type, feed), and post their new entries.
+
+        Returns a dict mapping the name of each feed that was fetched and parsed
+        to the timestamps of its entries; feeds that were not modified or could
+        not be fetched are missing.
+        """
+        self._claimed_entries = set()
+        self._run_fingerprints = FingerprintIndex()
+        self._run_started = time.time()
+        self._poll_timestamps = {}
+        self._feed_holds = defaultdict(int)
+        self._unsaved_feeds = set()
+        for _, feed in feeds_to_fetch:
+            self._feed_holds[feed['name']] += 1
+        try:
+            # Fetch the feeds of every channel type concurrently, within each channel's fetch window
+            logging.info(f"Fetching {len(feeds_to_fetch)} feeds")
+            self.prepare_fetches([feed for _, feed in feeds_to_fetch])
+            
+            # Each channel posts as soon as its own feeds are ready, in parallel with the other channels
+            pipelines = []
+            for channel_type, channel_id, channel in channel_jobs:
+                channel_feeds = [feed for feed_type, feed in feeds_to_fetch if feed_type == channel_type]
+                if not channel_feeds:
+                    continue
+                logging.info(f"Processing channel: {channel_type} (ID: {channel_id})")
+                pipelines.append(self.process_channel(channel_type, channel, channel_feeds))
+            await asyncio.gather(*pipelines)
+            return self._poll_timestamps
+        finally:
+            self.diagnostics.flush()
+            self.write_run_report()
+
+    def write_run_report(self):
+        """Log a one-line summary of the run and write the full report to run_report_file."""
+        report = self.stats.report()
+        counts = report['counts']
+        logging.info(
+            f"Run took {report['duration']:.1f}s: {counts.get('feeds_fetched', 0)} feeds fetched "
+            f"({counts.get('bytes_downloaded', 0)} bytes), {counts.get('entries_new', 0)} new entries, "
+            f"{counts.get('messages_sent', 0)} messages sent"
+        )
+        if not self.run_report_file:
+            return
+        try:
+            self.stats.write(self.run_report_file, report)
+        except OSError as e:
+            logging.error(f"Error writing run report to {self.run_report_file}: {str(e)}")
+
+    def prune_database(self):
+        """Drop expired outbox messages, seen entries and dedup fingerprints."""
+        self.prune_outbox()
+        self.prune_seen_entries()
+        self.prune_fingerprints()
+
+    async def check_all_feeds(self):
+        """Check all feeds for new entries"""
+        try:
+            await self._init_session()
+            # Start the run report before pruning, so the pruning time is part of it
+            self.stats.reset()
+            self.prune_database()
+            
+            # Resolve every channel up front so all of their feeds can be fetched together
+            channel_jobs = self.resolve_channel_jobs()
+            
+            if self.outbox_only:
+                await asyncio.gather(*(
+                    self.drain_outbox(channel_type, channel) for channel_type, _, channel in channel_jobs
+                ))
+                return
+            
+            await self.check_feeds(channel_jobs, self.feeds_of_channels(channel_jobs))
         except Exception as e:
             logging.error(f"Error in check_all_feeds: {str(e)}")
             import traceback
             logging.error(f"Stack trace:\n{traceback.format_exc()}")
-        finally:
-            if self._session and not self._closed:
-                await self._session.close()
+
+    def next_poll_interval(self, feed_name, timestamps):
+        """Work out how long to wait before polling a feed again, after a poll found entries at timestamps.
+
+        Feeds that were not modified (or failed) back off from their previous
+        interval; the others are re-estimated from their entries and hints.
+        """
+        previous = self._poll_intervals.get(feed_name, self.poll_min_interval)
+        interval = None
+        if timestamps:
+            interval = estimate_poll_interval(
+                timestamps, self._poll_hints.get(feed_name, (None, None)),
+                self.poll_min_interval, self.poll_max_interval
+            )
+        if interval is None:
+            interval = min(previous * 1.5, self.poll_max_interval)
+        self._poll_intervals[feed_name] = interval
+        return interval
+
+    def save_poll_schedule(self, feed_name, interval, next_poll):
+        """Persist a feed's polling interval and next poll time, so a restart keeps the schedule."""
+        try:
+            with self._get_db() as (conn, cur):
+                with conn:
+                    cur.execute('''
+                        INSERT INTO feed_state (feed_name, poll_interval, next_poll, updated_at)
+                        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                        ON CONFLICT(feed_name) DO UPDATE SET
+                            poll_interval = excluded.poll_interval,
+                            next_poll = excluded.next_poll,
+                            updated_at = excluded.updated_at
+                    ''', (feed_name, interval, next_poll))
+        except Exception as e:
+            logging.error(f"Error saving poll schedule for {feed_name}: {str(e)}")
+
+    async def run_daemon(self):
+        """Keep polling every feed on its own learned interval until the bot is closed.
+
+        Feeds sit in a priority queue by next poll time. Feeds that fall due
+        within poll_batch_window of each other are checked together, so their
+        new entries share messages.
+        """
+        await self._init_session()
+        channel_jobs = self.resolve_channel_jobs()
+        feeds = self.feeds_of_channels(channel_jobs)
+        if not feeds:
+            logging.error("No feeds to poll, daemon not started")
+            return
+        
+        # Resume the stored schedule; feeds never polled start right away, spread by the jitter
+        states = self.load_feed_states(feed['name'] for _, feed in feeds)
+        scheduler = PollScheduler()
+        now = time.time()
+        for channel_type, feed in feeds:
+            state = states.get(feed['name'], {})
+            if state.get('poll_interval'):
+                self._poll_intervals[feed['name']] = state['poll_interval']
+            if self.from_start:
+                next_poll = now
+            else:
+                next_poll = state.get('next_poll') or now + random.uniform(0, self.poll_batch_window)
+            scheduler.schedule(next_poll, (channel_type, feed))
+        logging.info(f"Polling {len(feeds)} feeds in daemon mode")
+        
+        while not self._closed:
+            now = time.time()
+            due = scheduler.pop_due(now, self.poll_batch_window)
+            if not due:
+                await asyncio.sleep(max(0.0, scheduler.next_time() - now))
+                continue
+            
+            try:
+                self.stats.reset()
+                self.prune_database()
+                results = await self.check_feeds(channel_jobs, due)
+            except Exception as e:
+                logging.error(f"Error in daemon poll: {str(e)}")
+                logging.error(f"Stack trace:\n{traceback.format_exc()}")
+                results = {}
+            # Processing everything again only applies to the first poll of each feed
+            self.from_start = False
+            
+            now = time.time()
+            for channel_type, feed in due:
+                interval = self.next_poll_interval(feed['name'], results.get(feed['name']))
+                next_poll = now + interval * random.uniform(1 - self.poll_jitter, 1 + self.poll_jitter)
+                scheduler.schedule(next_poll, (channel_type, feed))
+                self.save_poll_schedule(feed['name'], interval, next_poll)
+            logging.info(f"Polled {len(due)} feeds, next poll in {scheduler.next_time() - now:.0f}s")
 
     async def _init_session(self):
         """Initialize aiohttp session if not already initialized"""
@@ -1434,20 +3613,70 @@ class RSSMonitor(discord.Client):
             await self._session.close()
             self._session = None
 
+def benchmark_html_backends(paths, rounds=5):
+    """Compare the throughput of the HTML-to-text backends on saved feed bodies."""
+    import feedparser
+    contents = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            feed_data = feedparser.parse(f.read())
+        contents.extend(content for content in map(_entry_content, feed_data.entries) if content)
+    total_bytes = sum(len(content.encode('utf-8')) for content in contents)
+    print(f"{len(contents)} entries, {total_bytes / 1024:.1f} KiB of HTML from {len(paths)} feeds")
+    if not contents:
+        return
+
+    reference = [' '.join(_html_to_text_bs4(content).split()) for content in contents]
+    for name, backend in HTML_TEXT_BACKENDS.items():
+        if name == 'lxml' and not _lxml_available():
+            print(f"{name:>8}: not installed")
+            continue
+        start = time.perf_counter()
+        for _ in range(rounds):
+            texts = [backend(content) for content in contents]
+        elapsed = (time.perf_counter() - start) / rounds
+        differing = sum(' '.join(text.split()) != ref for text, ref in zip(texts, reference))
+        print(f"{name:>8}: {total_bytes / elapsed / 1024 / 1024:8.2f} MiB/s  "
+              f"{elapsed * 1000:8.1f} ms/run  {differing} entries differ from bs4")
+
 async def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--from-start', action='store_true', help='Process all entries from May 2025, ignoring seen entries')
     parser.add_argument('--category', choices=['engineering', 'data_analytics', 'management'], 
                       help='Run bot for specific category only')
+    parser.add_argument('--retry-outbox', action='store_true',
+                      help='Only resend the messages left in the outbox, without checking feeds')
+    parser.add_argument('--daemon', action='store_true',
+                      help='Keep running and poll each feed on its own interval instead of checking all feeds once')
+    parser.add_argument('--benchmark-html', nargs='+', metavar='FEED_FILE',
+                      help='Benchmark the HTML-to-text backends on saved feed files and exit')
+    parser.add_argument('--setup-nltk', action='store_true',
+                      help='Download the NLTK data used by sentence_splitter: nltk and exit')
     args = parser.parse_args()
 
+    load_dotenv()
+    config = load_config()
+    setup_logging(config)
+
+    if args.setup_nltk:
+        setup_nltk()
+        return
+
+    if args.benchmark_html:
+        benchmark_html_backends(args.benchmark_html)
+        return
+
     # Log the arguments for debugging
     logging.info(f"Starting bot with arguments: from_start={args.from_start}, category={args.category}")
 
-    monitor = RSSMonitor(from_start=args.from_start, target_category=args.category)
+    monitor = RSSMonitor(from_start=args.from_start, target_category=args.category, outbox_only=args.retry_outbox,
+                          daemon=args.daemon, config=config)
     
     try:
-        await monitor.start(os.getenv('DISCORD_TOKEN'))
+        if monitor.posting_mode == 'rest':
+            await monitor.run_without_gateway(os.getenv('DISCORD_TOKEN'))
+        else:
+            await monitor.run_with_gateway(os.getenv('DISCORD_TOKEN'))
     except Exception as e:
         logging.error(f"Error in main: {str(e)}")
     finally:
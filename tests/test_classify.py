@@ -0,0 +1,97 @@
+"""classify_entry must give the same answers as a plain substring test per keyword."""
+import random
+
+import pytest
+
+import rss_discord_bot
+from rss_discord_bot import CATEGORY_KEYWORDS, CATEGORY_PRIORITY, KeywordMatcher, classify_entry
+
+FILLER_WORDS = ['the', 'new', 'release', 'of', 'our', 'team', 'with', 'notes', 'on', 'scaling', 'and', 'a']
+
+
+def reference_classify(channel_type, feed_name, title, content):
+    """Score the categories with one substring scan per keyword, like the original get_category."""
+    text = f"{feed_name} {title} {content}".lower()
+    scores = {}
+    for category, keyword_sets in CATEGORY_KEYWORDS[channel_type].items():
+        if category == 'default':
+            continue
+        score = 2 * sum(keyword in text for keyword in keyword_sets['primary'])
+        score += sum(keyword in text for keyword in keyword_sets['secondary'])
+        if any(keyword in text for keyword in keyword_sets.get('exclude', [])):
+            score = 0
+        scores[category] = score
+    best = max(scores.values())
+    if best > 0:
+        for category in CATEGORY_PRIORITY.get(channel_type, CATEGORY_PRIORITY['management']):
+            if scores.get(category) == best:
+                return category
+    return 'default'
+
+
+def channel_keywords(channel_type):
+    return sorted({
+        keyword
+        for keyword_sets in CATEGORY_KEYWORDS[channel_type].values()
+        for key in ('primary', 'secondary', 'exclude')
+        for keyword in keyword_sets.get(key, [])
+    })
+
+
+def random_text(rng, keywords):
+    """Mix whole keywords, keyword fragments, glued keywords and filler words."""
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        choice = rng.random()
+        keyword = rng.choice(keywords)
+        if choice < 0.4:
+            parts.append(keyword)
+        elif choice < 0.6:
+            start = rng.randint(0, len(keyword) - 1)
+            parts.append(keyword[start:rng.randint(start + 1, len(keyword))])
+        elif choice < 0.7:
+            parts.append(keyword + rng.choice(keywords))
+        else:
+            parts.append(rng.choice(FILLER_WORDS))
+    text = ' '.join(parts)
+    return text.upper() if rng.random() < 0.1 else text
+
+
+@pytest.fixture(params=['regex', 'ahocorasick'])
+def backend(request, monkeypatch):
+    """Run the test with the regex trie and, when it is installed, the Aho-Corasick automaton."""
+    if request.param == 'regex':
+        monkeypatch.setattr(rss_discord_bot, 'ahocorasick', None)
+    else:
+        monkeypatch.setattr(rss_discord_bot, 'ahocorasick', pytest.importorskip('ahocorasick'))
+    rss_discord_bot._get_category_matcher.cache_clear()
+    yield request.param
+    rss_discord_bot._get_category_matcher.cache_clear()
+
+
+@pytest.mark.parametrize('channel_type', sorted(CATEGORY_KEYWORDS))
+def test_matcher_finds_substrings(backend, channel_type):
+    keywords = channel_keywords(channel_type)
+    matcher = KeywordMatcher(keywords)
+    rng = random.Random(f"matcher-{channel_type}")
+    for _ in range(500):
+        text = random_text(rng, keywords).lower()
+        assert matcher.find(text) == {keyword for keyword in keywords if keyword in text}, text
+
+
+@pytest.mark.parametrize('channel_type', sorted(CATEGORY_KEYWORDS))
+def test_classify_entry_matches_reference(backend, channel_type):
+    keywords = channel_keywords(channel_type)
+    rng = random.Random(f"classify-{channel_type}")
+    for _ in range(1000):
+        feed_name = rng.choice(['Example Blog', 'Tech Weekly', random_text(rng, keywords)])
+        title, content = random_text(rng, keywords), random_text(rng, keywords)
+        expected = reference_classify(channel_type, feed_name, title, content)
+        assert classify_entry(channel_type, feed_name, title, content, []) == expected, (feed_name, title, content)
+
+
+def test_keyword_prefixes_and_overlaps(backend):
+    matcher = KeywordMatcher(['data', 'data science', 'science', 'ai', 'rain'])
+    assert matcher.find('big data science on the training set') == {'data', 'data science', 'science', 'ai', 'rain'}
+    assert matcher.find('databases') == {'data'}
+    assert matcher.find('') == set()
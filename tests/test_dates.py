@@ -0,0 +1,42 @@
+"""EntryDateResolver gives the same dates with or without a learned hint."""
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from rss_discord_bot import EntryDateResolver
+
+PUBLISHED = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+UPDATED = datetime(2024, 2, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def parsed(value):
+    return time.struct_time(value.timetuple())
+
+
+def test_published_wins_over_a_learned_updated_hint():
+    resolver = EntryDateResolver()
+    assert resolver.resolve({'updated_parsed': parsed(UPDATED)}) == UPDATED
+    entry = {'published_parsed': parsed(PUBLISHED), 'updated_parsed': parsed(UPDATED)}
+    assert resolver.resolve(entry) == EntryDateResolver().resolve(entry) == PUBLISHED
+
+
+def test_string_hint_does_not_change_the_field():
+    resolver = EntryDateResolver('updated\t%Y-%m-%dT%H:%M:%S%z')
+    entry = {'published': 'Mon, 01 Jan 2024 10:00:00 +0000', 'updated': '2024-02-01T10:00:00+0000'}
+    assert resolver.resolve(entry) == PUBLISHED
+
+
+@pytest.mark.parametrize('value', [
+    '2024-01-01T10:00:00+0000',
+    '2024-01-01 10:00:00+0000',
+    '2024-01-01T10:00:00Z',
+    'Mon, 01 Jan 2024 10:00:00 GMT',
+    '01 Jan 2024 10:00:00 +0000',
+])
+def test_string_formats(value):
+    assert EntryDateResolver().resolve({'published': value}) == PUBLISHED
+
+
+def test_ambiguous_day_month_dates_are_not_guessed():
+    assert EntryDateResolver().resolve({'published': '02/01/2024'}) is None
@@ -0,0 +1,66 @@
+"""Cross-feed duplicate detection through the banded SimHash index."""
+import random
+
+import pytest
+
+from rss_discord_bot import SIMHASH_BANDS, SIMHASH_BITS, FingerprintIndex, RSSMonitor
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    config = {
+        'rss_feeds': {},
+        'settings': {'channels': {}, 'log_file': str(tmp_path / 'bot.log'), 'db_path': str(tmp_path / 'bot.db')},
+    }
+    monitor = RSSMonitor(config=config)
+    yield monitor
+    monitor._close_db()
+
+
+def random_fingerprint(rng):
+    return rng.getrandbits(SIMHASH_BITS) - (1 << (SIMHASH_BITS - 1))
+
+
+def flip_bits(fingerprint, bits):
+    for bit in bits:
+        fingerprint ^= 1 << bit
+    return fingerprint - (1 << SIMHASH_BITS) if fingerprint >= 1 << (SIMHASH_BITS - 1) else fingerprint
+
+
+def entry(feed_name, entry_id, fingerprint):
+    return {'feed_name': feed_name, 'id': entry_id, 'link': f"https://{feed_name}/{entry_id}",
+            'canonical_link': f"https://{feed_name}/{entry_id}", 'simhash': fingerprint}
+
+
+def test_candidates_stay_few_as_history_grows(monitor):
+    rng = random.Random('candidates')
+    lookups = [entry('new', f"n{i}", random_fingerprint(rng)) for i in range(55)]
+    stored = 0
+    for size in (5000, 20000):
+        monitor.record_fingerprints([
+            entry(f"feed{i % 50}", f"e{i}", random_fingerprint(rng)) for i in range(stored, size)
+        ])
+        stored = size
+        candidates = monitor.find_fingerprint_candidates('new', lookups)
+        # About len(lookups) * SIMHASH_BANDS * size / 2 ** 16 rows are expected by chance
+        assert len(candidates) <= 3 * len(lookups) * SIMHASH_BANDS * size / 2 ** 16 + 10
+        assert len(candidates) < size / 100
+
+
+def test_near_duplicates_match_across_feeds_only(monitor):
+    rng = random.Random('near')
+    original = random_fingerprint(rng)
+    monitor.record_fingerprints([entry('alpha', 'a1', original)])
+    near = flip_bits(original, [0, 20, 40])
+    assert monitor.find_duplicates('beta', [entry('beta', 'b1', near)]) == {0: ('alpha', 'a1')}
+    assert monitor.find_duplicates('alpha', [entry('alpha', 'a2', near)]) == {}
+    far = flip_bits(original, [0, 1, 20, 21, 40, 41, 60, 61])
+    assert monitor.find_duplicates('gamma', [entry('gamma', 'c1', far)]) == {}
+
+
+def test_link_match_is_not_hidden_by_own_entry():
+    index = FingerprintIndex()
+    index.add(('alpha', 'a1'), 'https://example.com/post', None)
+    index.add(('beta', 'b1'), 'https://example.com/post', None)
+    assert index.match(('alpha', 'a1'), 'https://example.com/post', None, 3) == ('beta', 'b1')
+    assert index.match(('gamma', 'c1'), 'https://example.com/other', None, 3) is None
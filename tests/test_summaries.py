@@ -0,0 +1,46 @@
+"""The built-in sentence splitter and summaries on a fixture corpus, and their equivalence with NLTK."""
+import json
+import os
+
+import pytest
+
+from rss_discord_bot import HTML_TEXT_BACKENDS, split_sentences, summarize_content
+
+with open(os.path.join(os.path.dirname(__file__), 'fixtures', 'summaries.json')) as f:
+    CORPUS = json.load(f)
+
+
+def nltk_sent_tokenize():
+    """Get NLTK's sent_tokenize, skipping the test when NLTK or its punkt data is not installed."""
+    tokenize = pytest.importorskip('nltk.tokenize')
+    try:
+        tokenize.sent_tokenize('Check. Data.')
+    except LookupError:
+        pytest.skip('NLTK punkt data is not installed (run with --setup-nltk)')
+    return tokenize.sent_tokenize
+
+
+@pytest.mark.parametrize('case', CORPUS['sentences'], ids=lambda case: case['text'][:30])
+def test_split_sentences(case):
+    assert split_sentences(case['text']) == case['sentences']
+
+
+@pytest.mark.parametrize('html_backend', sorted(HTML_TEXT_BACKENDS))
+@pytest.mark.parametrize('case', CORPUS['summaries'], ids=lambda case: case['tldr'][:30])
+def test_summaries(case, html_backend):
+    if html_backend != 'stdlib':
+        pytest.importorskip('bs4' if html_backend == 'bs4' else 'lxml')
+    assert summarize_content(case['content'], html_backend=html_backend) == case['tldr']
+
+
+@pytest.mark.parametrize('case', CORPUS['sentences'], ids=lambda case: case['text'][:30])
+def test_split_sentences_matches_nltk(case):
+    sent_tokenize = nltk_sent_tokenize()
+    assert split_sentences(case['text']) == sent_tokenize(case['text'])
+
+
+@pytest.mark.parametrize('case', CORPUS['summaries'], ids=lambda case: case['tldr'][:30])
+def test_summaries_match_nltk(case):
+    nltk_sent_tokenize()
+    assert (summarize_content(case['content'], html_backend='stdlib', sentence_splitter='nltk')
+            == summarize_content(case['content'], html_backend='stdlib', sentence_splitter='builtin'))